@@ -0,0 +1,58 @@
+# Trabalho pesado fora do thread dos quadros.
+#
+# Um thread só, alimentado por uma fila limitada: gravar a partida, calcular
+# estatísticas do profiler, importar módulos na abertura... Nada disso pode
+# mexer em widgets ou no canvas (só o thread principal pode); quem precisa
+# mostrar o resultado agenda isso com Clock.schedule_once.
+#
+# submit() devolve um concurrent.futures.Future (no modo asyncio dá para
+# esperar com `await asyncio.wrap_future(future)`). Com a fila cheia:
+#   - drop=False espera abrir espaço (trabalho que não pode se perder, como
+#     a gravação, que também precisa manter a ordem);
+#   - drop=True descarta a tarefa e devolve None (estatísticas, telemetria).
+import queue
+import threading
+from concurrent.futures import Future
+
+WORKER_QUEUE_SIZE = 64
+
+class BackgroundWorker:
+    def __init__(self, maxsize=WORKER_QUEUE_SIZE, name='background'):
+        self.queue = queue.Queue(maxsize)
+        self.done = 0     # Tarefas concluídas
+        self.errors = 0   # Tarefas que levantaram exceção
+        self.dropped = 0  # Tarefas descartadas com a fila cheia (drop=True)
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+    def submit(self, fn, *args, drop=False):
+        future = Future()
+        try:
+            self.queue.put((future, fn, args), block=not drop)
+        except queue.Full:
+            self.dropped += 1
+            return None
+        return future
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                self.errors += 1
+                future.set_exception(e)
+            self.done += 1
+    def close(self, wait=True):
+        # Termina depois das tarefas já enfileiradas
+        if not self.thread.is_alive():
+            return
+        self.queue.put(None)
+        if wait:
+            self.thread.join()
+    def stats(self):
+        return {'queued': self.queue.qsize(), 'done': self.done,
+                'errors': self.errors, 'dropped': self.dropped}
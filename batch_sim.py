@@ -0,0 +1,123 @@
+# Partidas sem janela em lote, para ajustar a dificuldade.
+#
+# Roda N partidas (uma seed por partida, a partir de --seed) num pool de
+# processos, cada uma com uma política de jogador (policies.POLICIES) e,
+# opcionalmente, constantes trocadas (missile_core.TUNABLES). Com vários
+# valores numa constante (--set LEVEL_INTERVAL=20,30,40) cada combinação
+# roda as N seeds. Cada partida vira uma linha do CSV de saída, gravada assim
+# que termina: tempo sobrevivido, pontos, nível e cidades perdidas, mais as
+# constantes usadas. Ao fim, imprime a média por combinação. --waves troca
+# as ondas padrão por uma definição em JSON (ver waves.py).
+#
+# A saída é CSV (por linha), não um formato colunar como Parquet: cada
+# partida é gravada assim que termina, então uma varredura interrompida
+# guarda o que já rodou, e não entra dependência além de kivy e numpy. Para
+# análise colunar basta carregar o CSV (pandas, polars, DuckDB).
+#
+#   python batch_sim.py --games 1000 --output tuning.csv
+#   python batch_sim.py --games 200 --set ENEMY_SPAWN_INTERVAL=1.5,2 --hz 30 --output spawn.csv
+#   python batch_sim.py --games 200 --waves levels/rush.json --output rush.csv
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from missile_core import MissileCommandSim, TUNABLES, TICK_RATE, check_tunable
+from policies import POLICIES
+from waves import load_waves
+
+COLUMNS = ('seed', 'policy', 'survival_time', 'score', 'level', 'cities_lost', 'game_over', 'ticks')
+
+def play(task):
+    # Uma partida completa; roda num processo do pool
+    seed, policy_name, overrides, max_time, tick_rate, waves = task
+    sim = MissileCommandSim(seed=seed, tick_rate=tick_rate, overrides=overrides, waves=waves)
+    policy = POLICIES[policy_name]()
+    cities = len(sim.cities)
+    ticks = 0
+    while not sim.game_over and sim.elapsed_time < max_time:
+        policy(sim)
+        sim.step()
+        ticks += 1
+    row = {
+        'seed': seed,
+        'policy': policy_name,
+        'survival_time': round(sim.elapsed_time, 3),
+        'score': sim.score,
+        'level': sim.level,
+        'cities_lost': cities - len(sim.cities),
+        'game_over': int(sim.game_over),
+        'ticks': ticks,
+    }
+    row.update(overrides)
+    return row
+
+def parse_overrides(items):
+    # ['NOME=1,2', ...] -> lista de dicts, um por combinação dos valores
+    names, choices = [], []
+    for item in items:
+        name, _, values = item.partition('=')
+        if name not in TUNABLES:
+            raise SystemExit(f"constante desconhecida: {name} (opções: {', '.join(TUNABLES)})")
+        names.append(name)
+        try:
+            choices.append([float(v) for v in values.split(',')])
+        except ValueError:
+            raise SystemExit(f"valor inválido para {name}: {values} (use números separados por vírgula)")
+        for value in choices[-1]:
+            try:
+                check_tunable(name, value)
+            except ValueError as e:
+                raise SystemExit(str(e))
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partidas do Missile Command em lote")
+    parser.add_argument('--games', type=int, default=100, help="partidas por combinação de constantes")
+    parser.add_argument('--seed', type=int, default=0, help="seed da primeira partida")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='intercept')
+    parser.add_argument('--set', action='append', default=[], metavar='NOME=V1,V2',
+                        help="troca uma constante (pode repetir; vários valores = varredura)")
+    parser.add_argument('--waves', metavar='ARQUIVO', help="definição de ondas em JSON (ver waves.py)")
+    parser.add_argument('--max-time', type=float, default=300,
+                        help="segundos de jogo antes de encerrar uma partida (padrão 300)")
+    parser.add_argument('--hz', type=int, default=TICK_RATE, help="passos da simulação por segundo")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', default='batch.csv', help="CSV de saída (padrão batch.csv)")
+    args = parser.parse_args(argv)
+    if args.hz <= 0:
+        raise SystemExit(f"--hz deve ser maior que zero (recebeu {args.hz})")
+
+    configs = parse_overrides(args.set)
+    names = list(configs[0])
+    waves = load_waves(args.waves) if args.waves else None
+    tasks = [(args.seed + i, args.policy, overrides, args.max_time, args.hz, waves)
+             for overrides in configs for i in range(args.games)]
+    totals = {}  # combinação -> [partidas, soma do tempo, soma dos pontos]
+    start = time.perf_counter()
+    with open(args.output, 'w', newline='') as f, Pool(args.workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=list(COLUMNS) + names)
+        writer.writeheader()
+        chunksize = max(1, len(tasks) // (args.workers * 8))
+        for n, row in enumerate(pool.imap(play, tasks, chunksize=chunksize), 1):
+            writer.writerow(row)
+            key = tuple(row[name] for name in names)
+            total = totals.setdefault(key, [0, 0.0, 0])
+            total[0] += 1
+            total[1] += row['survival_time']
+            total[2] += row['score']
+            if n % 50 == 0:
+                f.flush()
+                print(f"\r{n}/{len(tasks)} partidas", end='', file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    print(f"\r{len(tasks)} partidas em {elapsed:.1f}s ({len(tasks)/elapsed:.1f}/s) -> {args.output}",
+          file=sys.stderr)
+    for key, (games, survival, score) in totals.items():
+        label = ' '.join(f"{name}={value:g}" for name, value in zip(names, key)) or 'padrão'
+        print(f"{label:40} tempo médio {survival/games:7.1f}s  pontos médios {score/games:6.1f}")
+
+if __name__ == '__main__':
+    main()
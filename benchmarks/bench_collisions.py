@@ -0,0 +1,70 @@
+# Benchmark das colisões: N mísseis inimigos contra N explosões.
+# Compara o teste par-a-par antigo (math.hypot para cada explosão x míssil)
+# com a grade espacial e mede o passo completo da simulação. Com a grade o
+# custo por entidade fica estável conforme N cresce.
+#
+#   python -m benchmarks.bench_collisions
+import math
+import random
+import time
+
+from missile_core import MissileCommandSim, INTERCEPTOR_EXPLOSION_RANGE
+
+SIZES = (25, 50, 100, 200, 400, 800)
+REPEATS = 20
+
+def populate(n, seed):
+    sim = MissileCommandSim(seed=seed)
+    rng = random.Random(seed)
+    for _ in range(n):
+        start = (rng.uniform(0, sim.width), rng.uniform(300, sim.height))
+        target = rng.choice(sim.cities).pos
+        sim.add_enemy(start, target, 180)
+    for _ in range(n):
+        explosion = sim.add_explosion((rng.uniform(0, sim.width), rng.uniform(300, sim.height)),
+                                      INTERCEPTOR_EXPLOSION_RANGE)
+        explosion.radius = rng.uniform(2, INTERCEPTOR_EXPLOSION_RANGE - 5)
+    return sim
+
+def brute_force_hits(sim):
+    enemies = list(sim.enemy_missiles.items())
+    hits = set()
+    for explosion in sim.explosions:
+        ex, ey = explosion.center_point
+        for eid, x, y in enemies:
+            if math.hypot(x-ex, y-ey) < explosion.radius:
+                hits.add(eid)
+    return hits
+
+def grid_hits(sim):
+    enemies = sim.enemy_missiles
+    grid = sim.enemy_grid
+    grid.build(enemies.x, enemies.y, enemies.eids)
+    explosions = sim.explosions
+    _, point = grid.query_circles([e.center_point[0] for e in explosions],
+                                  [e.center_point[1] for e in explosions],
+                                  [e.radius for e in explosions])
+    return set(grid.ids[point].tolist())
+
+def best_of(fn, n):
+    best = math.inf
+    for seed in range(REPEATS):
+        sim = populate(n, seed)
+        start = time.perf_counter()
+        fn(sim)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    for n in SIZES[:2]:
+        sim = populate(n, 0)
+        assert brute_force_hits(sim) == grid_hits(sim)
+    print(f"{'N':>5} {'par-a-par ms':>13} {'grade ms':>9} {'passo ms':>9} {'passo us/entidade':>18}")
+    for n in SIZES:
+        brute = best_of(brute_force_hits, n)
+        grid = best_of(grid_hits, n)
+        step = best_of(MissileCommandSim.step, n)
+        print(f"{n:>5} {brute:>13.3f} {grid:>9.3f} {step:>9.3f} {step*1000/(2*n):>18.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+# Benchmarks sem janela da simulação, com cenários roteirizados.
+#
+# Cada cenário monta uma MissileCommandSim, roda um número fixo de passos
+# (com uma política de jogador) e mede passos/s, os percentis de latência
+# por passo e o pico de memória (tracemalloc, numa segunda rodada para não
+# distorcer os tempos). O resultado pode ser salvo em JSON e comparado com
+# uma rodada anterior; uma piora acima da tolerância faz o comando sair com
+# código 1.
+#
+#   python -m benchmarks.harness --output bench.json
+#   python -m benchmarks.harness --baseline bench.json --tolerance 0.25
+#   python -m benchmarks.harness --replay partida.mcr  # partida real (replay.py)
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from missile_core import MissileCommandSim, LEVEL_INTERVAL, BOMB_DROP_INTERVAL
+from policies import IdlePolicy, InterceptPolicy
+from profiler import percentile
+from replay import Replay, ReplayPolicy
+
+# ===== CENÁRIOS =====
+# Cada cenário devolve (sim, política, passos); a preparação não é medida.
+def steady_level1(seed):
+    # Jogo normal no nível 1 (os primeiros LEVEL_INTERVAL segundos)
+    sim = MissileCommandSim(seed=seed)
+    return sim, InterceptPolicy(), int(LEVEL_INTERVAL * sim.tick_rate) - 1
+
+def level10(seed):
+    # Começa no nível 10: inimigos a INITIAL_ENEMY_SPEED + 10*ENEMY_SPEED_PER_LEVEL px/s
+    sim = MissileCommandSim(seed=seed)
+    sim.start_level(10)
+    return sim, InterceptPolicy(), 1800
+
+def bomb_200(seed):
+    # Power-up de bomba detonando 200 inimigos de uma vez no primeiro passo
+    sim = MissileCommandSim(seed=seed)
+    rng = np.random.default_rng(seed)
+    for x, y in zip(rng.uniform(50, sim.width-50, 200), rng.uniform(400, sim.height, 200)):
+        target = sim.cities[int(rng.integers(len(sim.cities)))].pos
+        sim.add_enemy((x, y), target, 60)
+    powerup = sim.add_powerup((sim.width/2, sim.height-30), 'bomb')
+    class DetonateOnce:
+        def __call__(self, sim):
+            if powerup in sim.powerups:
+                sim.touch(*powerup.pos)
+    return sim, DetonateOnce(), 180
+
+def airplane_bombs(seed):
+    # Seis aviões em sequência, com bombas caindo ao mesmo tempo
+    sim = MissileCommandSim(seed=seed)
+    for i in range(6):
+        sim.add_airplane((-50 - 60*i, sim.height-250 - 40*i), BOMB_DROP_INTERVAL * (0.2 + 0.1*i))
+    return sim, IdlePolicy(), 600
+
+SCENARIOS = {
+    'steady_level1': steady_level1,
+    'level10': level10,
+    'bomb_200': bomb_200,
+    'airplane_bombs': airplane_bombs,
+}
+
+def replay_scenario(path):
+    # Uma partida real gravada (MC_RECORD) como cenário; a seed é a gravada
+    replay = Replay(path)
+    def scenario(seed):
+        return replay.new_sim(), ReplayPolicy(replay.touches), replay.end_tick
+    return scenario
+
+# ===== MEDIÇÃO =====
+def run_timed(scenario, seed):
+    sim, policy, ticks = scenario(seed)
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(ticks):
+        t = clock()
+        policy(sim)
+        sim.step()
+        latencies.append(clock() - t)
+    total = clock() - start
+    return ticks, total, latencies
+
+def run_memory(scenario, seed):
+    sim, policy, ticks = scenario(seed)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(ticks):
+        policy(sim)
+        sim.step()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - baseline
+
+def run_scenario(name, seed=1, repeat=3):
+    scenario = SCENARIOS[name]
+    best = None
+    latencies = []
+    for _ in range(repeat):
+        ticks, total, lat = run_timed(scenario, seed)
+        latencies.extend(lat)
+        best = total if best is None else min(best, total)
+    latencies.sort()
+    ms = [x * 1000 for x in latencies]
+    return {
+        'ticks': ticks,
+        'ticks_per_sec': ticks / best,
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95),
+        'p99_ms': percentile(ms, 99),
+        'max_ms': ms[-1],
+        'peak_mem_kb': run_memory(scenario, seed) / 1024,
+    }
+
+# ===== COMPARAÇÃO =====
+# Métrica -> (maior é melhor?, diferença absoluta mínima para contar como
+# regressão; evita falhar por ruído em valores muito pequenos)
+METRICS = {
+    'ticks_per_sec': (True, 0),
+    'p95_ms': (False, 0.05),
+    'p99_ms': (False, 0.05),
+    'peak_mem_kb': (False, 32),
+}
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in results['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if old is None:
+            continue
+        for metric, (higher_is_better, min_delta) in METRICS.items():
+            if not old.get(metric):
+                continue
+            delta = current[metric] - old[metric]
+            change = delta / old[metric]
+            if higher_is_better:
+                worse = change < -tolerance and -delta > min_delta
+            else:
+                worse = change > tolerance and delta > min_delta
+            if worse:
+                regressions.append((name, metric, old[metric], current[metric], change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks sem janela do Missile Command")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="cenário a rodar (pode repetir; padrão: todos)")
+    parser.add_argument('--replay', action='append', default=[], metavar='ARQUIVO',
+                        help="partida gravada (replay.py) usada como cenário extra")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="salva os resultados neste JSON")
+    parser.add_argument('--baseline', help="JSON de uma rodada anterior para comparar")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="piora relativa aceita antes de falhar (padrão 0.25)")
+    args = parser.parse_args(argv)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed': args.seed,
+        },
+        'scenarios': {},
+    }
+    print(f"{'cenário':16}{'passos/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'pico KB':>10}")
+    names = list(args.scenario or ([] if args.replay else SCENARIOS))
+    for path in args.replay:
+        name = 'replay:' + os.path.basename(path)
+        SCENARIOS[name] = replay_scenario(path)
+        names.append(name)
+    for name in names:
+        r = results['scenarios'][name] = run_scenario(name, args.seed, args.repeat)
+        print(f"{name:16}{r['ticks_per_sec']:>10.0f}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}"
+              f"{r['p99_ms']:>9.3f}{r['max_ms']:>9.3f}{r['peak_mem_kb']:>10.1f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, metric, old, new, change in regressions:
+            print(f"REGRESSÃO {name}.{metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# Memória da simulação: bytes por entidade de cada tipo, uma cena com 1000
+# entidades (memória alocada e pico de RSS do processo) e, opcionalmente, uma
+# sessão longa para ver se a memória cresce com o tempo de jogo.
+#
+# Bytes por entidade vêm do tracemalloc: quanto a simulação alocou para criar
+# N entidades do tipo (o registro, a posição nos arrays ou registries e os
+# eventos agendados para ela), dividido por N.
+#
+#   python -m benchmarks.memory
+#   python -m benchmarks.memory --session 1800  # 30 min de jogo, amostras a cada minuto
+import argparse
+import resource
+import sys
+import tracemalloc
+
+import numpy as np
+
+from missile_core import MissileCommandSim
+from particles import ParticleSystem, MAX_PARTICLES
+from policies import InterceptPolicy
+
+SCENE = {  # Composição da cena de 1000 entidades
+    'enemy': 500,
+    'interceptor': 200,
+    'explosion': 100,
+    'bomb': 100,
+    'airplane': 50,
+    'powerup': 50,
+}
+
+def add_entities(sim, kind, n, rng):
+    for x, y in zip(rng.uniform(50, sim.width-50, n).tolist(), rng.uniform(400, sim.height-300, n).tolist()):
+        target = sim.cities[int(rng.integers(len(sim.cities)))].pos
+        if kind == 'enemy':
+            sim.add_enemy((x, y), target, 120)
+        elif kind == 'interceptor':
+            sim.add_interceptor((x, 100), (x, y))
+        elif kind == 'explosion':
+            sim.add_explosion((x, y), sim.INTERCEPTOR_EXPLOSION_RANGE)
+        elif kind == 'bomb':
+            sim.add_bomb((x, y), target)
+        elif kind == 'airplane':
+            sim.add_airplane((-50, y))
+        else:
+            sim.add_powerup((x, y), 'bomb')
+
+def traced(fn):
+    # (bytes ainda alocados ao fim, pico) do que fn() alocou
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current - before, peak - before
+
+def bytes_per_entity(kind, n=1000, seed=1):
+    sim = MissileCommandSim(seed=seed)
+    rng = np.random.default_rng(seed)
+    current, _ = traced(lambda: add_entities(sim, kind, n, rng))
+    return current / n
+
+def particle_bytes():
+    # As partículas vivem em arrays de capacidade fixa, alocados uma vez
+    systems = []
+    current, _ = traced(lambda: systems.append(ParticleSystem()))
+    return current / MAX_PARTICLES
+
+def peak_rss_kb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 if sys.platform == 'darwin' else rss  # bytes no macOS, KB no Linux
+
+def scene(seed=1, ticks=120):
+    sims = []
+    def build():
+        sim = MissileCommandSim(seed=seed)
+        rng = np.random.default_rng(seed)
+        for kind, n in SCENE.items():
+            add_entities(sim, kind, n, rng)
+        for _ in range(ticks):
+            sim.step()
+        sims.append(sim)
+    rss_before = peak_rss_kb()
+    current, peak = traced(build)
+    return current, peak, rss_before, peak_rss_kb()
+
+def session(seconds, seed=1, sample_every=60):
+    # Joga (com reinício no game over) e mede a memória ainda alocada a cada
+    # `sample_every` segundos de jogo
+    sim = MissileCommandSim(seed=seed)
+    policy = InterceptPolicy()
+    samples = []
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    next_sample = 0
+    while sim.time < seconds:
+        if sim.game_over:
+            sim.touch(0, 0)
+        policy(sim)
+        sim.step()
+        if sim.time >= next_sample:
+            samples.append((sim.time, tracemalloc.get_traced_memory()[0] - base, sim.entity_count()))
+            next_sample += sample_every
+    tracemalloc.stop()
+    return samples
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memória da simulação do Missile Command")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--session', type=float, metavar='SEGUNDOS',
+                        help="também joga uma sessão longa e mostra a memória ao longo dela")
+    args = parser.parse_args(argv)
+
+    print(f"{'entidade':14}{'bytes/entidade':>16}")
+    for kind in SCENE:
+        print(f"{kind:14}{bytes_per_entity(kind, seed=args.seed):>16.0f}")
+    print(f"{'particle':14}{particle_bytes():>16.0f}")
+    current, peak, rss_before, rss_after = scene(args.seed)
+    total = sum(SCENE.values())
+    print(f"\ncena com {total} entidades: {current/1024:.1f} KB alocados ({current/total:.0f} B/entidade), "
+          f"pico {peak/1024:.1f} KB")
+    print(f"pico de RSS do processo: {rss_after/1024:.1f} MB (antes da cena {rss_before/1024:.1f} MB)")
+    if args.session:
+        print(f"\n{'tempo s':>8}{'alocado KB':>12}{'entidades':>11}")
+        for t, allocated, entities in session(args.session, args.seed):
+            print(f"{t:>8.0f}{allocated/1024:>12.1f}{entities:>11}")
+
+if __name__ == '__main__':
+    main()
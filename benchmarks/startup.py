@@ -0,0 +1,72 @@
+# Tempo de abertura do app, medido de verdade: roda "Missele Command.py" do
+# zero (processo novo, sem caches do interpretador em memória) várias vezes
+# com MC_STARTUP_EXIT=1, lê os marcos gravados (MC_STARTUP_TRACE) e imprime a
+# mediana de cada um. Sai com código 1 se a mediana de algum marco passar do
+# orçamento (STARTUP_BUDGET no app, ou --budget).
+#
+#   python -m benchmarks.startup
+#   python -m benchmarks.startup --headless --runs 10 --budget first_frame=400
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Missele Command.py')
+
+# Sem janela nem GL (CI, contêineres); os tempos de GL não entram na conta
+HEADLESS_ENV = {'SDL_VIDEODRIVER': 'offscreen', 'KIVY_GL_BACKEND': 'mock'}
+
+def run_once(headless):
+    fd, trace_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    env = dict(os.environ, MC_STARTUP_TRACE=trace_path, MC_STARTUP_EXIT='1', KIVY_NO_ARGS='1',
+               KIVY_NO_CONSOLELOG='1')
+    if headless:
+        env.update(HEADLESS_ENV)
+    try:
+        subprocess.run([sys.executable, APP], env=env, check=True, timeout=120,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(trace_path) as f:
+            return json.load(f)
+    finally:
+        os.remove(trace_path)
+
+def parse_budget(items):
+    budget = {}
+    for item in items:
+        name, _, ms = item.partition('=')
+        budget[name] = float(ms)
+    return budget
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de abertura do Missile Command")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--headless', action='store_true', help="sem janela (SDL offscreen, GL falso)")
+    parser.add_argument('--budget', action='append', default=[], metavar='MARCO=MS',
+                        help="troca o orçamento de um marco (pode repetir)")
+    parser.add_argument('--output', help="salva as medianas neste JSON")
+    args = parser.parse_args(argv)
+
+    runs = [run_once(args.headless) for _ in range(args.runs)]
+    budget = dict(runs[0]['budget'], **parse_budget(args.budget))
+    medians = {name: statistics.median(run['marks'][name] for run in runs) for name in runs[0]['marks']}
+    over = []
+    print(f"{'marco':20}{'mediana ms':>12}{'máx ms':>10}{'orçamento':>11}")
+    for name, ms in medians.items():
+        worst = max(run['marks'][name] for run in runs)
+        limit = budget.get(name)
+        print(f"{name:20}{ms:>12.1f}{worst:>10.1f}{'' if limit is None else f'{limit:.0f}':>11}")
+        if limit is not None and ms > limit:
+            over.append(name)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'runs': args.runs, 'medians': medians, 'budget': budget}, f, indent=2)
+    for name in over:
+        print(f"FORA DO ORÇAMENTO {name}: {medians[name]:.1f} ms > {budget[name]:.0f} ms")
+    return 1 if over else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
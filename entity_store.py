@@ -0,0 +1,176 @@
+# Armazenamento das entidades da simulação.
+#
+# MissileStore guarda os mísseis em "estrutura de arrays": cada campo (x, y,
+# direção, velocidade, alvo) fica num array NumPy contíguo, e mover todos os
+# mísseis é uma única operação vetorizada por passo. A
+# posição do passo anterior (px, py) fica guardada para o desenho interpolar
+# entre os dois últimos passos.
+# EntityRegistry guarda as demais entidades (cidades, bombas, aviões...).
+#
+# Nos dois, a entidade é identificada pelo eid (nunca reaproveitado, então
+# serve de handle estável) e a remoção é adiada: kill() só marca, a entidade
+# some das consultas na hora e flush() tira de fato no fim do passo, com
+# troca pelo último elemento (O(1) por remoção, sem copiar listas).
+import math
+
+import numpy as np
+
+class MissileStore:
+    FIELDS = ('x', 'y', 'px', 'py', 'dx', 'dy', 'speed', 'tx', 'ty')
+    def __init__(self, missile_type, capacity=64):
+        self.missile_type = missile_type  # 'enemy' ou 'interceptor'
+        self.count = 0
+        self.index_of = {}  # eid -> índice nos arrays
+        self.dead = set()   # eids marcados para remoção no próximo flush
+        self.eid = np.zeros(capacity, dtype=np.int64)
+        for name in self.FIELDS:
+            setattr(self, '_' + name, np.zeros(capacity))
+    def __len__(self):
+        return self.count - len(self.dead)
+    def __contains__(self, eid):
+        return eid in self.index_of and eid not in self.dead
+    # Visões das partes ocupadas dos arrays (sem cópia); incluem os mísseis
+    # marcados com kill() até o flush
+    @property
+    def eids(self):
+        return self.eid[:self.count]
+    @property
+    def x(self):
+        return self._x[:self.count]
+    @property
+    def y(self):
+        return self._y[:self.count]
+    @property
+    def px(self):
+        return self._px[:self.count]
+    @property
+    def py(self):
+        return self._py[:self.count]
+    @property
+    def dx(self):
+        return self._dx[:self.count]
+    @property
+    def dy(self):
+        return self._dy[:self.count]
+    @property
+    def speed(self):
+        return self._speed[:self.count]
+    @property
+    def tx(self):
+        return self._tx[:self.count]
+    @property
+    def ty(self):
+        return self._ty[:self.count]
+    def grow(self):
+        capacity = len(self.eid) * 2
+        self.eid = np.resize(self.eid, capacity)
+        for name in self.FIELDS:
+            setattr(self, '_' + name, np.resize(getattr(self, '_' + name), capacity))
+    def add(self, eid, pos, target, speed):
+        if self.count == len(self.eid):
+            self.grow()
+        i = self.count
+        dx = target[0] - pos[0]
+        dy = target[1] - pos[1]
+        dist = math.hypot(dx, dy) or 0.001
+        self.eid[i] = eid
+        self._x[i], self._y[i] = pos
+        self._px[i], self._py[i] = pos
+        self._dx[i], self._dy[i] = dx/dist, dy/dist
+        self._speed[i] = speed
+        self._tx[i], self._ty[i] = target
+        self.index_of[eid] = i
+        self.count += 1
+    def kill(self, eid):
+        if eid not in self:
+            return False
+        self.dead.add(eid)
+        return True
+    def flush(self):
+        for eid in self.dead:
+            self._remove(eid)
+        self.dead.clear()
+    def _remove(self, eid):
+        # Troca com o último elemento para remover em O(1)
+        i = self.index_of.pop(eid)
+        last = self.count - 1
+        if i != last:
+            moved = int(self.eid[last])
+            self.eid[i] = moved
+            for name in self.FIELDS:
+                arr = getattr(self, '_' + name)
+                arr[i] = arr[last]
+            self.index_of[moved] = i
+        self.count = last
+    def clear(self):
+        self.count = 0
+        self.index_of.clear()
+        self.dead.clear()
+    def pos(self, eid):
+        i = self.index_of[eid]
+        return (float(self._x[i]), float(self._y[i]))
+    def target(self, eid):
+        i = self.index_of[eid]
+        return (float(self._tx[i]), float(self._ty[i]))
+    def items(self):
+        # (eid, x, y) de cada míssil, para quem precisa iterar (renderização).
+        # Inclui os marcados com kill() até o flush.
+        n = self.count
+        return zip(self.eid[:n].tolist(), self._x[:n].tolist(), self._y[:n].tolist())
+    def move(self, dt):
+        # A velocidade é em pixels por segundo
+        n = self.count
+        self._px[:n] = self._x[:n]
+        self._py[:n] = self._y[:n]
+        self._x[:n] += self._dx[:n] * self._speed[:n] * dt
+        self._y[:n] += self._dy[:n] * self._speed[:n] * dt
+    def interpolated(self, alpha):
+        # Posições (x, y) entre o passo anterior (alpha=0) e o atual (alpha=1)
+        n = self.count
+        px, py = self._px[:n], self._py[:n]
+        return px + (self._x[:n] - px)*alpha, py + (self._y[:n] - py)*alpha
+
+class EntityRegistry:
+    def __init__(self):
+        self.items = []     # Entidades em ordem densa (a ordem muda nas remoções)
+        self.index_of = {}  # eid -> índice em items
+        self.dead = set()
+    def __len__(self):
+        return len(self.items) - len(self.dead)
+    def __iter__(self):
+        dead = self.dead
+        for entity in self.items:
+            if entity.eid not in dead:
+                yield entity
+    def __contains__(self, entity):
+        return entity.eid in self.index_of and entity.eid not in self.dead
+    def __getitem__(self, i):
+        # Acesso por posição; só faz sentido depois do flush
+        return self.items[i]
+    def get(self, eid):
+        i = self.index_of.get(eid)
+        if i is None or eid in self.dead:
+            return None
+        return self.items[i]
+    def add(self, entity):
+        self.index_of[entity.eid] = len(self.items)
+        self.items.append(entity)
+        return entity
+    def kill(self, entity):
+        if entity not in self:
+            return False
+        self.dead.add(entity.eid)
+        return True
+    def flush(self):
+        items = self.items
+        for eid in self.dead:
+            i = self.index_of.pop(eid)
+            last = items.pop()
+            if last.eid != eid:
+                items[i] = last
+                self.index_of[last.eid] = i
+        self.dead.clear()
+    def clear(self):
+        self.items.clear()
+        self.index_of.clear()
+        self.dead.clear()
@@ -0,0 +1,543 @@
+# Widgets e lógica de tela do jogo. Fica fora de "Missele Command.py" para
+# que o app mostre o primeiro quadro antes de importar tudo isto (ver lá).
+from kivy.uix.widget import Widget
+from kivy.clock import Clock
+from kivy.graphics import Ellipse, Color, InstructionGroup, Mesh, PushMatrix, PopMatrix, Translate, Scale
+from kivy.graphics.scissor_instructions import ScissorPush, ScissorPop
+from kivy.graphics.texture import Texture
+from kivy.config import Config
+from kivy.core.window import Window
+from kivy.core.text import Label as CoreLabel
+from kivy.metrics import sp
+from kivy.uix.label import Label
+from kivy.properties import NumericProperty, ListProperty, StringProperty
+from kivy.logger import Logger
+from time import perf_counter
+
+import numpy as np
+
+from pools import Pool
+from quality import QualityScaler
+from viewport import Viewport
+from particles import ParticleSystem, PARTICLE_TINTS, MAX_PARTICLES, quad_vertices, quad_indices
+from missile_core import (
+    MissileCommandSim, CITY_RADIUS, AA_BASE_RADIUS, MISSILE_RADIUS_ENEMY,
+    MISSILE_RADIUS_INTERCEPTOR, TICK_RATE,
+)
+
+# A lógica do jogo fica em missile_core.MissileCommandSim; os widgets abaixo
+# apenas desenham o estado das entidades da simulação. Posições e tamanhos
+# das entidades estão em unidades do mundo (viewport.py): elas ficam numa
+# camada (WorldLayer) desenhada com a transformação mundo -> tela; placar e
+# textos ficam por cima, em coordenadas da tela.
+
+# Pools dos widgets mais criados: (quantos pré-alocar, máximo guardado livre)
+POOL_SIZES = {
+    'missile': (32, 256),
+    'explosion': (16, 256),
+}
+
+# A simulação anda em passos fixos (MC_SIM_HZ por segundo, padrão TICK_RATE)
+# e o desenho acontece a cada quadro da tela, interpolando entre os dois
+# últimos passos; o fps do desenho segue o do Kivy (ex.: KCFG_GRAPHICS_MAXFPS=120).
+# Depois de um quadro muito atrasado, no máximo MAX_STEPS_PER_FRAME passos
+# são recuperados e o resto do atraso é descartado.
+MAX_STEPS_PER_FRAME = 5
+
+def lerp(prev, pos, alpha):
+    return (prev[0] + (pos[0]-prev[0])*alpha, prev[1] + (pos[1]-prev[1])*alpha)
+
+# ===== ENTIDADES DO JOGO =====
+class City(Widget):
+    pos = ListProperty([0, 0])
+    def __init__(self, city, **kwargs):
+        super().__init__(**kwargs)
+        self.pos = city.pos
+        with self.canvas:
+            Color(0, 0, 1)
+            self.ellipse = Ellipse(pos=(city.pos[0]-CITY_RADIUS, city.pos[1]-CITY_RADIUS),
+                                   size=(CITY_RADIUS*2, CITY_RADIUS*2))
+
+class AntiAircraft(Widget):
+    pos = ListProperty([0, 0])
+    def __init__(self, aa, **kwargs):
+        super().__init__(**kwargs)
+        self.pos = aa.pos
+        with self.canvas:
+            Color(1, 1, 0)
+            self.ellipse = Ellipse(pos=(aa.pos[0]-AA_BASE_RADIUS, aa.pos[1]-AA_BASE_RADIUS),
+                                   size=(AA_BASE_RADIUS*2, AA_BASE_RADIUS*2))
+
+# Entidades que se movem desenham a geometria uma vez, em coordenadas locais,
+# atrás de um Translate: mover troca só a matriz (nada de recalcular os
+# vértices da Ellipse), e sync() não escreve no canvas se a posição não mudou.
+class MovingView(Widget):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.drawn_pos = None
+        with self.canvas:
+            PushMatrix()
+            self.translate = Translate()
+            self.draw()
+            PopMatrix()
+    def draw(self):
+        # Instruções da entidade, com a origem na posição dela
+        pass
+    def sync(self, pos):
+        if pos != self.drawn_pos:
+            self.drawn_pos = pos
+            self.translate.xy = pos
+
+# Os mísseis vivem em arrays na simulação; o widget só recebe a posição.
+# Missile e Explosion são reaproveitados via Pool: o construtor cria as
+# instruções uma vez e reset() prepara o reuso.
+class Missile(MovingView):
+    def draw(self):
+        self.missile_type = None
+        self.color = Color(1, 0, 0)
+        self.ellipse = Ellipse(pos=(0, 0))
+    def reset(self, pos, missile_type):
+        if missile_type != self.missile_type:
+            self.missile_type = missile_type
+            if missile_type == 'enemy':
+                self.color.rgb = (1, 0, 0)
+                self.ellipse.size = (MISSILE_RADIUS_ENEMY*2, MISSILE_RADIUS_ENEMY*2)
+            else:
+                self.color.rgb = (0, 1, 0)
+                self.ellipse.size = (MISSILE_RADIUS_INTERCEPTOR*2, MISSILE_RADIUS_INTERCEPTOR*2)
+        self.sync(pos)
+
+# Círculo de raio 1 atrás de Translate + Scale: a explosão crescer também
+# não refaz a geometria
+class Explosion(Widget):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.drawn_radius = None
+        with self.canvas:
+            PushMatrix()
+            self.translate = Translate()
+            self.scale = Scale(1, 1, 1)
+            Color(1, 0.5, 0)
+            Ellipse(pos=(-1, -1), size=(2, 2))
+            PopMatrix()
+    def reset(self, explosion):
+        self.translate.xy = explosion.center_point
+        self.sync(explosion)
+    def sync(self, explosion):
+        radius = explosion.radius
+        if radius != self.drawn_radius:
+            self.drawn_radius = radius
+            self.scale.xyz = (radius, radius, 1)
+
+# Desenha todas as partículas (de todas as explosões) com poucos Mesh: um por
+# combinação de cor e nível de transparência, em vez de Color+Ellipse por
+# partícula.
+class ParticleRenderer(InstructionGroup):
+    TINTS = ((1, 0.45, 0), (1, 0.85, 0))  # Uma cor por PARTICLE_TINTS
+    ALPHA_LEVELS = 4
+    def __init__(self, system):
+        super().__init__()
+        self.system = system
+        self.indices = quad_indices(MAX_PARTICLES)
+        texture = self.make_dot_texture()
+        self.meshes = []
+        for rgb in self.TINTS[:PARTICLE_TINTS]:
+            for level in range(self.ALPHA_LEVELS):
+                self.add(Color(*rgb, (level+1) / self.ALPHA_LEVELS))
+                mesh = Mesh(mode='triangles', texture=texture)
+                self.add(mesh)
+                self.meshes.append(mesh)
+    @staticmethod
+    def make_dot_texture(size=16):
+        # Círculo branco com borda suave; a cor vem do Color de cada Mesh
+        r = (np.arange(size) + 0.5 - size/2) / (size/2)
+        dist = np.hypot(r[None, :], r[:, None])
+        alpha = (np.clip((1 - dist) * size/2, 0, 1) * 255).astype(np.uint8)
+        pixels = np.full((size, size, 4), 255, dtype=np.uint8)
+        pixels[..., 3] = alpha
+        texture = Texture.create(size=(size, size), colorfmt='rgba')
+        texture.blit_buffer(pixels.tobytes(), colorfmt='rgba', bufferfmt='ubyte')
+        return texture
+    def update(self):
+        system = self.system
+        n = len(system)
+        if not n:
+            for mesh in self.meshes:
+                mesh.indices = []
+            return
+        level = np.minimum((system.alpha() * self.ALPHA_LEVELS).astype(np.int64), self.ALPHA_LEVELS-1)
+        bucket = system.field('tint') * self.ALPHA_LEVELS + level
+        order = np.argsort(bucket, kind='stable')
+        verts = quad_vertices(system.field('x')[order], system.field('y')[order],
+                              system.field('radius')[order])
+        counts = np.bincount(bucket, minlength=len(self.meshes)).tolist()
+        start = 0
+        for mesh, count in zip(self.meshes, counts):
+            if count:
+                mesh.vertices = verts[start*16:(start+count)*16]
+            mesh.indices = self.indices[:count*6]
+            start += count
+
+# Todos os "!" de aviso num único Mesh, usando uma textura do glifo
+# renderizada uma vez só (em vez de um Label por míssil)
+class WarningLayer(InstructionGroup):
+    def __init__(self):
+        super().__init__()
+        glyph = CoreLabel(text="!", font_size=sp(20), color=(1, 0, 0, 1))
+        glyph.refresh()
+        self.half_w = glyph.texture.width / 2
+        self.half_h = glyph.texture.height / 2
+        # A textura de texto vem invertida; tex_coords já traz os cantos certos
+        self.uv = np.array(glyph.texture.tex_coords, dtype=np.float32).reshape(4, 2)
+        self.indices = quad_indices(MAX_PARTICLES)
+        self.add(Color(1, 1, 1, 1))
+        self.mesh = Mesh(mode='triangles', texture=glyph.texture)
+        self.add(self.mesh)
+    def update(self, x, y):
+        # x, y: posições dos mísseis avisados; o "!" fica 15px acima e à direita
+        n = min(len(x), MAX_PARTICLES)
+        if n:
+            self.mesh.vertices = quad_vertices(x[:n]+15, y[:n]+15, self.half_w, self.half_h, self.uv)
+        self.mesh.indices = self.indices[:n*6]
+
+class ScoreLabel(Label):
+    score = NumericProperty(0)
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.text = "Score: 0"
+        self.font_size = '28sp'
+        self.color = (1, 1, 1, 1)
+        self.bold = True
+        self.pos = (0, 0)
+        self._update_pos()
+        Window.bind(on_resize=self._update_pos)
+    def _update_pos(self, *args):
+        self.center_x = Window.width/2
+        self.top = Window.height - 20
+    def update_score(self, new_score):
+        self.score = new_score
+        self.text = f"Score: {self.score}"
+
+class GameOverLabel(Label):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.text = "GAME OVER\nToque para reiniciar"
+        self.font_size = '40sp'
+        self.color = (1, 0, 0, 1)
+        self.center = Window.center
+
+def summary_text(summary):
+    lines = [f"{'':14}{'p50':>7}{'p95':>7}{'p99':>7}"]
+    for key, (p50, p95, p99) in summary.items():
+        lines.append(f"{key:14}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+    return "\n".join(lines)
+
+# Mostra os percentis (p50/p95/p99, em ms) de cada fase do quadro. Com um
+# worker, ordenar as amostras e montar o texto fica fora do quadro; só trocar
+# o texto do Label volta para o thread principal
+class ProfilerOverlay(Label):
+    def __init__(self, profiler, worker=None, **kwargs):
+        super().__init__(**kwargs)
+        self.profiler = profiler
+        self.worker = worker
+        self.font_name = 'RobotoMono-Regular'
+        self.font_size = '11sp'
+        self.color = (0.6, 1, 0.6, 1)
+        self.halign = 'left'
+        self.valign = 'top'
+        self.size = (Window.width*0.6, Window.height*0.3)
+        self.text_size = self.size
+        self.pos = (10, Window.height - self.height - 80)
+        Clock.schedule_interval(self.refresh, 0.5)
+    def refresh(self, dt):
+        if self.worker is None:
+            self.text = summary_text(self.profiler.summary())
+            return
+        rows = self.profiler.snapshot()
+        future = self.worker.submit(lambda: summary_text(self.profiler.summary(rows)), drop=True)
+        if future is not None:
+            future.add_done_callback(self.show)
+    def show(self, future):
+        # Roda no worker: o Label só é tocado no próximo quadro
+        if future.exception() is None:
+            text = future.result()
+            Clock.schedule_once(lambda dt: setattr(self, 'text', text))
+
+# ===== POWER-UPS (mantidos) =====
+class BombPowerUp(MovingView):
+    powerup_type = StringProperty("bomb")
+    def __init__(self, powerup, **kwargs):
+        super().__init__(**kwargs)
+        self.sync(powerup.pos)
+    def draw(self):
+        Color(1, 1, 1)
+        Ellipse(pos=(-15, -15), size=(30, 30))
+
+class SlowMotionPowerUp(MovingView):
+    powerup_type = StringProperty("slow")
+    def __init__(self, powerup, **kwargs):
+        super().__init__(**kwargs)
+        self.sync(powerup.pos)
+    def draw(self):
+        Color(0, 0, 1)
+        Ellipse(pos=(-15, -15), size=(30, 30))
+
+# ===== AVIÃO E BOMBA =====
+class Bomb(MovingView):
+    def __init__(self, bomb, **kwargs):
+        super().__init__(**kwargs)
+        self.sync(bomb.pos)
+    def draw(self):
+        Color(1, 1, 0)
+        Ellipse(pos=(-10, -10), size=(20, 20))
+
+class Airplane(MovingView):
+    def __init__(self, airplane, **kwargs):
+        super().__init__(**kwargs)
+        self.sync(airplane.pos)
+    def draw(self):
+        Color(0.7, 0.7, 0.7)
+        Ellipse(pos=(0, 0), size=(50, 20))
+
+# Camada das entidades: Translate + Scale do viewport no canvas.before e o
+# desenho cortado na área do mundo (as sobras da tela ficam vazias). As
+# instruções só mudam em apply(), chamado quando a janela muda de tamanho.
+class WorldLayer(Widget):
+    def __init__(self, viewport, **kwargs):
+        super().__init__(**kwargs)
+        self.viewport = viewport
+        with self.canvas.before:
+            PushMatrix()
+            self.scissor = ScissorPush()
+            self.translate = Translate()
+            self.scale = Scale(1, 1, 1)
+        self.overlays = InstructionGroup()  # Partículas e avisos, por cima das entidades
+        self.canvas.after.add(self.overlays)
+        self.canvas.after.add(ScissorPop())
+        self.canvas.after.add(PopMatrix())
+        self.apply()
+    def apply(self):
+        viewport = self.viewport
+        x, y, width, height = viewport.screen_rect()
+        self.scissor.x, self.scissor.y = int(x), int(y)
+        self.scissor.width, self.scissor.height = int(width), int(height)
+        self.translate.xy = viewport.offset
+        self.scale.xyz = (viewport.scale, viewport.scale, 1)
+
+# ===== LÓGICA PRINCIPAL DO JOGO =====
+class MissileCommandGame(Widget):
+    def __init__(self, seed=None, pool_sizes=None, profiler=None, tick_rate=TICK_RATE, record_path=None,
+                 waves=None, quality=None, worker=None, **kwargs):
+        super().__init__(**kwargs)
+        Window.clearcolor = (0.1,0.1,0.1,1)
+        self.widgets_added = 0
+        self.widgets_removed = 0
+        # A simulação roda no tamanho padrão do mundo, seja qual for a janela
+        self.sim = MissileCommandSim(seed=seed, tick_rate=tick_rate, waves=waves)
+        self.viewport = Viewport(self.sim.width, self.sim.height, Window.width, Window.height)
+        self.world = WorldLayer(self.viewport)
+        self.add_widget(self.world)
+        Window.bind(on_resize=self.on_window_resize)
+        # Trabalho que não é desenho (gravação, estatísticas) vai para o worker
+        # (background.BackgroundWorker), se houver
+        self.worker = worker
+        # Gravação opcional da partida (seed + toques) para reproduzir com replay.py
+        self.recorder = None
+        if record_path:
+            from replay import ReplayRecorder
+            self.recorder = ReplayRecorder(record_path, self.sim, worker)
+        self.accumulator = 0.0  # Tempo real ainda não simulado
+        self.alpha = 1.0        # Fração do próximo passo já decorrida (interpolação)
+        # Nível de qualidade do desenho, ajustado pelo tempo dos quadros
+        # (quality: nível fixo, 0 = o melhor; None = automático)
+        self.quality = QualityScaler(target_fps=Config.getint('graphics', 'maxfps') or 60, fixed=quality)
+        self.frame = 0
+        self.particle_dt = 0.0  # Tempo acumulado desde a última atualização das partículas
+        self.merged = set()     # Explosões desenhadas pela explosão que já estava ali
+        # Instrumentação opcional: FrameProfiler na simulação + overlay na tela
+        self.profiler = self.sim.profiler = profiler
+        self.views = {}     # eid -> widget que desenha a entidade
+        sizes = dict(POOL_SIZES, **(pool_sizes or {}))
+        self.pools = {
+            'missile': Pool(Missile, *sizes['missile']),
+            'explosion': Pool(Explosion, *sizes['explosion']),
+        }
+        self.view_pools = {Missile: self.pools['missile'], Explosion: self.pools['explosion']}
+        self.wave = None    # Nível cujos widgets já foram reservados nos pools
+        self.reserve_wave()
+        self.particles = ParticleSystem()
+        self.particle_renderer = ParticleRenderer(self.particles)
+        self.world.overlays.add(self.particle_renderer)
+        self.warning_layer = WarningLayer()
+        self.world.overlays.add(self.warning_layer)
+        self.score_label = ScoreLabel()
+        self.add_widget(self.score_label)
+        self.sync_views()
+        if profiler is not None:
+            # No canvas.after para ficar por cima de tudo sem entrar na contagem de widgets
+            self.overlay = ProfilerOverlay(profiler, worker)
+            self.canvas.after.add(self.overlay.canvas)
+    def start(self):
+        # O relógio do jogo só começa a contar quando ele aparece na tela
+        Clock.schedule_interval(self.update, 0)
+    def add_widget(self, widget, *args, **kwargs):
+        self.widgets_added += 1
+        return super().add_widget(widget, *args, **kwargs)
+    def remove_widget(self, widget, *args, **kwargs):
+        self.widgets_removed += 1
+        return super().remove_widget(widget, *args, **kwargs)
+    def on_window_resize(self, window, width, height):
+        self.viewport.fit(width, height)
+        self.world.apply()
+    def on_touch_down(self, touch):
+        x, y = self.viewport.to_world(touch.x, touch.y)
+        if self.recorder is not None:
+            x, y = self.recorder.touch(x, y)
+        # Sem redesenhar aqui: o próximo quadro já mostra o efeito do toque
+        self.sim.touch(x, y)
+    def update(self, dt):
+        frame_start = perf_counter()
+        profiler = self.profiler
+        sim = self.sim
+        tier = self.quality.tier
+        self.frame += 1
+        self.accumulator += dt
+        if profiler is not None:
+            profiler.begin_frame()
+        steps = 0
+        while self.accumulator >= sim.tick_dt:
+            if steps == MAX_STEPS_PER_FRAME:
+                self.accumulator %= sim.tick_dt
+                break
+            sim.step()
+            if self.recorder is not None:
+                self.recorder.step()
+            self.accumulator -= sim.tick_dt
+            steps += 1
+        self.alpha = self.accumulator / sim.tick_dt
+        self.reserve_wave()
+        if profiler is not None:
+            start = perf_counter()
+            added, removed = self.widgets_added, self.widgets_removed
+        self.sync_views()
+        self.particle_dt += dt
+        if self.frame % tier.particle_every == 0:
+            self.particles.update(self.particle_dt)
+            self.particle_renderer.update()
+            self.particle_dt = 0.0
+        self.sync_hud()
+        if self.quality.record((perf_counter() - frame_start) * 1000, dt * 1000):
+            Logger.info(f"Quality: nível {self.quality.tier.name}")
+        if profiler is not None:
+            profiler.end_frame(sim, render=(perf_counter() - start) * 1000, frame=dt * 1000,
+                               particles=len(self.particles), quality=self.quality.level,
+                               widgets_added=self.widgets_added - added,
+                               widgets_removed=self.widgets_removed - removed)
+    def reserve_wave(self):
+        # Nível novo: deixa no pool um Missile por inimigo que a onda vai criar
+        wave = self.sim.wave
+        if wave is not self.wave:
+            self.wave = wave
+            self.pools['missile'].reserve(wave.counts['enemy'])
+    def sync_views(self):
+        sim = self.sim
+        alpha = self.alpha
+        alive = set()
+        for entity in sim.cities:
+            self.sync_view(entity, City, alive)
+        for entity in sim.aa_bases:
+            self.sync_view(entity, AntiAircraft, alive)
+        self.sync_missiles(sim.enemy_missiles, alive)
+        self.sync_missiles(sim.interceptor_missiles, alive)
+        # Entidades que andam são desenhadas entre o passo anterior e o atual
+        for entity in sim.bombs:
+            self.sync_view(entity, Bomb, alive, lerp(entity.prev_pos, entity.pos, alpha))
+        for entity in sim.airplanes:
+            self.sync_view(entity, Airplane, alive, lerp(entity.prev_pos, entity.pos, alpha))
+        for entity in sim.powerups:
+            self.sync_view(entity, BombPowerUp if entity.powerup_type == "bomb" else SlowMotionPowerUp, alive,
+                           lerp(entity.prev_pos, entity.pos, alpha))
+        tier = self.quality.tier
+        drawn = []  # Explosões com widget neste quadro
+        for entity in sim.explosions:
+            alive.add(entity.eid)
+            if entity.eid in self.merged:
+                continue
+            view = self.views.get(entity.eid)
+            if view is None:
+                if tier.merge_explosions and self.covered(entity, drawn):
+                    self.merged.add(entity.eid)
+                    continue
+                view = self.views[entity.eid] = self.pools['explosion'].acquire()
+                view.reset(entity)
+                self.add_view(view)
+                self.particles.emit(entity.center_point, tier.particles)
+            else:
+                view.sync(entity)
+            drawn.append(entity)
+        self.merged &= alive
+        for eid in [eid for eid in self.views if eid not in alive]:
+            self.release_view(self.views.pop(eid))
+        if self.frame % tier.warning_every == 0:
+            self.sync_warnings()
+    @staticmethod
+    def covered(explosion, drawn):
+        # A explosão nasce dentro de outra já desenhada, de alcance parecido ou
+        # maior: em qualidade baixa não vale um widget (nem partículas) a mais
+        x, y = explosion.center_point
+        for other in drawn:
+            ox, oy = other.center_point
+            if ((x-ox)**2 + (y-oy)**2 < (other.explosion_range/2)**2
+                    and explosion.explosion_range <= other.explosion_range * 1.25):
+                return True
+        return False
+    def sync_hud(self):
+        # Uma vez por quadro: vários pontos no mesmo quadro (ex.: a bomba)
+        # geram uma só textura nova do placar
+        if self.sim.score != self.score_label.score:
+            self.score_label.update_score(self.sim.score)
+        self.check_game_over()
+    def sync_view(self, entity, view_class, alive, pos=None):
+        view = self.views.get(entity.eid)
+        if view is None:
+            view = self.views[entity.eid] = view_class(entity)
+            self.add_view(view)
+        if pos is not None:
+            view.sync(pos)
+        alive.add(entity.eid)
+    def add_view(self, view):
+        self.widgets_added += 1
+        self.world.add_widget(view)
+    def release_view(self, view):
+        self.widgets_removed += 1
+        self.world.remove_widget(view)
+        pool = self.view_pools.get(type(view))
+        if pool is not None:
+            pool.release(view)
+    def sync_missiles(self, store, alive):
+        xs, ys = store.interpolated(self.alpha)
+        for eid, x, y in zip(store.eids.tolist(), xs.tolist(), ys.tolist()):
+            view = self.views.get(eid)
+            if view is None:
+                view = self.views[eid] = self.pools['missile'].acquire()
+                view.reset((x, y), store.missile_type)
+                self.add_view(view)
+            else:
+                view.sync((x, y))
+            alive.add(eid)
+    def sync_warnings(self):
+        enemies = self.sim.enemy_missiles
+        flagged = self.sim.warnings
+        if flagged:
+            idx = [enemies.index_of[eid] for eid in flagged]
+            x, y = enemies.interpolated(self.alpha)
+            self.warning_layer.update(x[idx], y[idx])
+        else:
+            self.warning_layer.update((), ())
+    def check_game_over(self):
+        if self.sim.game_over and not hasattr(self, 'game_over_label'):
+            self.game_over_label = GameOverLabel()
+            self.add_widget(self.game_over_label)
+        elif not self.sim.game_over and hasattr(self, 'game_over_label'):
+            self.remove_widget(self.game_over_label)
+            del self.game_over_label
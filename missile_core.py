@@ -0,0 +1,626 @@
+# Núcleo da simulação do Missile Command, sem nenhuma dependência do Kivy.
+# O jogo avança em passos fixos (step) e usa um RNG próprio com seed, então
+# o mesmo seed e os mesmos toques geram sempre a mesma partida. A camada Kivy
+# só desenha o estado daqui.
+import math
+import random
+
+import numpy as np
+
+from entity_store import EntityRegistry, MissileStore
+from scheduler import EventScheduler
+from spatial_hash import SpatialHash
+from sweep import entry_time, swept_hits
+from waves import DEFAULT_WAVES, check_waves, compile_level
+
+# ===== CONSTANTES GLOBAIS =====
+CITY_RADIUS = 25
+AA_BASE_RADIUS = 20
+MISSILE_RADIUS_ENEMY = 10
+MISSILE_RADIUS_INTERCEPTOR = 4.5
+AIRPLANE_HIT_RADIUS = 30  # Distância do interceptor que derruba o avião
+BOMB_HIT_RADIUS = 15      # ... e que detona a bomba
+BASE_EXPLOSION_RANGE = 40         # Explosão "normal"
+INTERCEPTOR_EXPLOSION_RANGE = 60    # Explosão do interceptor
+BOMB_EXPLOSION_RANGE = 80           # Explosão da bomba
+INTERCEPTOR_LIFETIME = 6.0
+FIRE_COOLDOWN_TIME = 0.5
+ENEMY_SPAWN_INTERVAL = 2.0
+# Velocidades em pixels por segundo
+INITIAL_ENEMY_SPEED = 120
+ENEMY_SPEED_PER_LEVEL = 30
+INTERCEPTOR_SPEED = 360
+WARNING_DISTANCE = 80
+
+# Intervalos para power-ups, níveis, avião e bomb drop
+POWERUP_SPAWN_INTERVAL = 15.0       # Spawn de power-ups
+LEVEL_INTERVAL = 30.0               # Tempo para aumentar o nível
+SLOW_MOTION_DURATION = 5.0          # Duração do slow motion
+SLOW_MOTION_FACTOR = 0.5            # Velocidade dos inimigos no slow motion
+AIRPLANE_SPAWN_INTERVAL = 20.0      # Intervalo para o avião
+BOMB_DROP_INTERVAL = 3.0            # Tempo para o avião soltar bomb
+
+# Constantes acima que podem ser trocadas por simulação (overrides)
+TUNABLES = (
+    'BASE_EXPLOSION_RANGE', 'INTERCEPTOR_EXPLOSION_RANGE', 'BOMB_EXPLOSION_RANGE',
+    'INTERCEPTOR_LIFETIME', 'INTERCEPTOR_SPEED', 'FIRE_COOLDOWN_TIME',
+    'ENEMY_SPAWN_INTERVAL', 'INITIAL_ENEMY_SPEED', 'ENEMY_SPEED_PER_LEVEL', 'WARNING_DISTANCE',
+    'POWERUP_SPAWN_INTERVAL', 'LEVEL_INTERVAL', 'SLOW_MOTION_DURATION', 'SLOW_MOTION_FACTOR',
+    'AIRPLANE_SPAWN_INTERVAL', 'BOMB_DROP_INTERVAL',
+)
+# Intervalos, velocidades e durações precisam ser > 0 (com 0 um spawn ou
+# evento se reagenda no mesmo instante para sempre); as demais, >= 0
+POSITIVE_TUNABLES = (
+    'INTERCEPTOR_LIFETIME', 'INTERCEPTOR_SPEED', 'ENEMY_SPAWN_INTERVAL', 'INITIAL_ENEMY_SPEED',
+    'POWERUP_SPAWN_INTERVAL', 'LEVEL_INTERVAL', 'SLOW_MOTION_DURATION',
+    'AIRPLANE_SPAWN_INTERVAL', 'BOMB_DROP_INTERVAL',
+)
+
+# Passo fixo padrão da simulação (em Hz; configurável por simulação) e
+# resolução lógica padrão
+TICK_RATE = 60
+TIME_EPSILON = 1e-9  # Folga ao comparar instantes de eventos com o relógio
+DEFAULT_WIDTH = 1080
+DEFAULT_HEIGHT = 2200
+
+def check_tunable(name, value):
+    # ValueError se a constante não existe ou o valor está fora da faixa
+    if name not in TUNABLES:
+        raise ValueError(f"constante desconhecida: {name}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name}: esperava número, recebeu {value!r}")
+    if name in POSITIVE_TUNABLES:
+        if not value > 0:
+            raise ValueError(f"{name} deve ser maior que zero (recebeu {value:g})")
+    elif not value >= 0:
+        raise ValueError(f"{name} não pode ser negativa (recebeu {value:g})")
+
+def distance(pos1, pos2):
+    return math.hypot(pos1[0]-pos2[0], pos1[1]-pos2[1])
+
+# ===== ENTIDADES DO JOGO =====
+# Registros só com dados (o desenho fica em game.py). __slots__ tira o
+# __dict__ de cada instância: menos memória por entidade e acesso mais
+# rápido aos campos. Os mísseis nem são objetos: vivem nos arrays de
+# entity_store.MissileStore.
+class City:
+    __slots__ = ('eid', 'pos', 'lives')
+    def __init__(self, eid, pos):
+        self.eid = eid
+        self.pos = pos
+        self.lives = 3
+
+class AntiAircraft:
+    __slots__ = ('eid', 'pos')
+    def __init__(self, eid, pos):
+        self.eid = eid
+        self.pos = pos
+
+class Explosion:
+    __slots__ = ('eid', 'center_point', 'radius', 'explosion_range')
+    def __init__(self, eid, center, explosion_range=BASE_EXPLOSION_RANGE):
+        self.eid = eid
+        self.center_point = center
+        self.radius = 2
+        self.explosion_range = explosion_range
+    def update(self, dt):
+        self.radius += 60*dt
+        return self.radius >= self.explosion_range
+
+class PowerUp:
+    __slots__ = ('eid', 'pos', 'powerup_type', 'speed', 'prev_pos')
+    def __init__(self, eid, pos, powerup_type):
+        self.eid = eid
+        self.pos = pos
+        self.powerup_type = powerup_type  # 'bomb' ou 'slow'
+        self.speed = 50
+        self.prev_pos = pos  # Posição no passo anterior (para interpolar o desenho)
+    def move(self, dt):
+        self.prev_pos = self.pos
+        self.pos = (self.pos[0], self.pos[1] - self.speed*dt)
+
+class Bomb:
+    __slots__ = ('eid', 'pos', 'target', 'speed', 'distance', 'direction', 'prev_pos')
+    def __init__(self, eid, pos, target):
+        self.eid = eid
+        self.pos = pos
+        self.target = target  # A cidade-alvo
+        self.speed = 150
+        # O alvo não se move: a direção é calculada uma vez só
+        dx = target[0] - pos[0]
+        dy = target[1] - pos[1]
+        self.distance = math.hypot(dx, dy) or 0.001
+        self.direction = (dx/self.distance, dy/self.distance)
+        self.prev_pos = pos
+    def move(self, dt):
+        self.prev_pos = self.pos
+        step = self.speed*dt
+        self.pos = (self.pos[0] + self.direction[0]*step,
+                    self.pos[1] + self.direction[1]*step)
+
+class Airplane:
+    __slots__ = ('eid', 'pos', 'speed', 'bomb_interval', 'prev_pos')
+    def __init__(self, eid, pos, speed=200, bomb_interval=BOMB_DROP_INTERVAL):
+        self.eid = eid
+        self.pos = pos
+        self.speed = speed
+        self.bomb_interval = bomb_interval
+        self.prev_pos = pos
+    def move(self, dt):
+        self.prev_pos = self.pos
+        self.pos = (self.pos[0] + self.speed*dt, self.pos[1])
+
+# ===== SIMULAÇÃO =====
+class MissileCommandSim:
+    # Filas de eventos, uma por fase: cada fase dispara os seus eventos
+    # vencidos depois de mover as entidades dela. Os eventos dos inimigos
+    # seguem o relógio deles (enemy_time), que anda mais devagar no slow
+    # motion; os demais, o relógio da simulação (time).
+    EVENT_PHASES = ('enemies', 'warnings', 'interceptors', 'collisions', 'powerups', 'airplanes')
+    ENEMY_EVENT_PHASES = ('enemies', 'warnings')
+    # Constantes de jogo (TUNABLES) copiadas para a classe: o jogo lê sempre
+    # self.<NOME>, e overrides={'LEVEL_INTERVAL': 20, ...} troca o valor só
+    # nesta simulação (ajuste de dificuldade, batch_sim.py)
+    BASE_EXPLOSION_RANGE = BASE_EXPLOSION_RANGE
+    INTERCEPTOR_EXPLOSION_RANGE = INTERCEPTOR_EXPLOSION_RANGE
+    BOMB_EXPLOSION_RANGE = BOMB_EXPLOSION_RANGE
+    INTERCEPTOR_LIFETIME = INTERCEPTOR_LIFETIME
+    FIRE_COOLDOWN_TIME = FIRE_COOLDOWN_TIME
+    ENEMY_SPAWN_INTERVAL = ENEMY_SPAWN_INTERVAL
+    INITIAL_ENEMY_SPEED = INITIAL_ENEMY_SPEED
+    ENEMY_SPEED_PER_LEVEL = ENEMY_SPEED_PER_LEVEL
+    INTERCEPTOR_SPEED = INTERCEPTOR_SPEED
+    WARNING_DISTANCE = WARNING_DISTANCE
+    POWERUP_SPAWN_INTERVAL = POWERUP_SPAWN_INTERVAL
+    LEVEL_INTERVAL = LEVEL_INTERVAL
+    SLOW_MOTION_DURATION = SLOW_MOTION_DURATION
+    SLOW_MOTION_FACTOR = SLOW_MOTION_FACTOR
+    AIRPLANE_SPAWN_INTERVAL = AIRPLANE_SPAWN_INTERVAL
+    BOMB_DROP_INTERVAL = BOMB_DROP_INTERVAL
+    def __init__(self, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, seed=None, tick_rate=TICK_RATE,
+                 overrides=None, waves=None):
+        self.width = width
+        self.height = height
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        if not tick_rate > 0:
+            raise ValueError(f"tick_rate deve ser maior que zero (recebeu {tick_rate})")
+        self.tick_rate = tick_rate
+        # Ondas (waves.py; None = o jogo padrão); as constantes da definição
+        # valem como overrides, e os overrides explícitos têm a palavra final
+        self.waves = waves
+        if waves is not None:
+            check_waves(waves)
+        self.overrides = dict((waves or {}).get('constants', {}), **(overrides or {}))
+        for name, value in self.overrides.items():
+            check_tunable(name, value)
+            setattr(self, name, value)
+        self.tick_dt = 1.0 / tick_rate
+        # tick, relógios e eids não voltam a zero no reset: valem para a sessão inteira
+        self.tick = 0
+        self.time = 0.0
+        self.enemy_time = 0.0
+        self.dt = self.effective_dt = self.tick_dt
+        self._next_eid = 0
+        self.phase = None  # Fase em execução (None fora do step)
+        self.profiler = None  # FrameProfiler opcional (profiler.py)
+        self.reset()
+    def reset(self):
+        # Mísseis ficam em arrays (MissileStore) em vez de um objeto por míssil
+        self.enemy_missiles = MissileStore('enemy')
+        self.interceptor_missiles = MissileStore('interceptor')
+        # Grades de colisão, reconstruídas a cada passo depois que os mísseis andam
+        self.enemy_grid = SpatialHash()
+        self.interceptor_grid = SpatialHash()
+        # Demais entidades em registros indexados por eid; remoções feitas
+        # durante o passo só valem de fato no flush_removals() do fim do passo
+        self.explosions = EntityRegistry()
+        self.cities = EntityRegistry()
+        self.aa_bases = EntityRegistry()
+        self.warnings = set()  # eids dos mísseis inimigos perto de uma cidade
+        self.powerups = EntityRegistry()
+        self.airplanes = EntityRegistry()
+        self.bombs = EntityRegistry()  # Bombas lançadas pelo avião
+        # Eventos agendados (chegadas, impactos, bombas, avisos), por instante
+        self.events = {name: EventScheduler() for name in self.EVENT_PHASES}
+        self.score = 0
+        self.fire_cooldown = 0
+        self.slow_motion_active = False
+        self.slow_motion_timer = 0
+        self.game_over = False
+        # Spawns: a linha do tempo compilada do nível atual (self.wave)
+        self.start_level(1)
+        self.init_bases_and_cities()
+    def new_eid(self):
+        self._next_eid += 1
+        return self._next_eid
+    def init_bases_and_cities(self):
+        # Posiciona as cidades na parte inferior e os AA ao lado delas
+        self.city_positions = [
+            (self.width*0.25, 50),
+            (self.width*0.5, 50),
+            (self.width*0.75, 50)
+        ]
+        # AA posicionados próximos às cidades (à esquerda, centro e direita)
+        self.aa_positions = [
+            (self.width*0.25 - 40, 80),
+            (self.width*0.5, 80),
+            (self.width*0.75 + 40, 80)
+        ]
+        for pos in self.aa_positions:
+            self.aa_bases.add(AntiAircraft(self.new_eid(), pos))
+        for pos in self.city_positions:
+            self.cities.add(City(self.new_eid(), pos))
+    # ----- Spawns -----
+    # Tudo anda em linha reta com velocidade constante, então os momentos em
+    # que algo acontece (chegar ao alvo, atingir uma cidade, soltar uma
+    # bomba, sair da tela) são calculados uma vez, ao criar a entidade, e
+    # agendados (scheduler.py) em vez de testados a cada passo.
+    # Os parâmetros dos spawn_* vêm sorteados da compilação do nível (waves.py)
+    def spawn_enemy(self, start_x, target_roll, speed):
+        if not self.cities:
+            return
+        cities = list(self.cities)
+        target = cities[int(target_roll * len(cities))].pos
+        self.add_enemy((start_x, self.height), target, speed)
+    def spawn_airplane(self, speed, bomb_interval):
+        self.add_airplane((-50, self.height-250), speed=speed, bomb_interval=bomb_interval)
+    def spawn_powerup(self, x, powerup_type):
+        self.add_powerup((x, self.height-30), powerup_type)
+    def add_enemy(self, pos, target, speed):
+        eid = self.new_eid()
+        self.enemy_missiles.add(eid, pos, target, speed)
+        self.schedule_enemies([eid])
+        return eid
+    def add_interceptor(self, pos, target, speed=None):
+        speed = speed or self.INTERCEPTOR_SPEED
+        eid = self.new_eid()
+        self.interceptor_missiles.add(eid, pos, target, speed)
+        # Detona ao chegar no alvo ou quando acaba o tempo de vida, o que vier antes
+        arrive = distance(pos, target) / speed
+        self.schedule('interceptors', min(arrive, self.INTERCEPTOR_LIFETIME), 'detonate', eid,
+                      arrive <= self.INTERCEPTOR_LIFETIME)
+        return eid
+    def add_airplane(self, pos, first_drop=None, speed=200, bomb_interval=None):
+        if bomb_interval is None:
+            bomb_interval = self.BOMB_DROP_INTERVAL
+        if first_drop is None:
+            first_drop = bomb_interval
+        airplane = self.airplanes.add(Airplane(self.new_eid(), pos, speed, bomb_interval))
+        self.schedule('airplanes', first_drop, 'bomb_drop', airplane.eid)
+        self.schedule('airplanes', (self.width + 50 - pos[0]) / airplane.speed, 'airplane_exit', airplane.eid)
+        return airplane
+    def add_powerup(self, pos, powerup_type):
+        powerup = self.powerups.add(PowerUp(self.new_eid(), pos, powerup_type))
+        self.schedule('powerups', pos[1] / powerup.speed, 'powerup_exit', powerup.eid)
+        return powerup
+    def add_bomb(self, pos, target):
+        bomb = self.bombs.add(Bomb(self.new_eid(), pos, target))
+        # Explode a menos de 20 px do alvo
+        self.schedule('collisions', (bomb.distance - 20) / bomb.speed, 'bomb_impact', bomb.eid)
+        return bomb
+    def start_level(self, level):
+        # Começa (ou pula direto para) um nível: o relógio de jogo vai para o
+        # início dele e as regras de spawn recomeçam do zero
+        self.spawn_next = {}  # regra de spawn -> instante do próximo spawn
+        self.elapsed_time = (level - 1) * (self.waves or {}).get('level_duration', self.LEVEL_INTERVAL)
+        self.enter_level(level, self.elapsed_time)
+    def enter_level(self, level, start):
+        self.level = level
+        self.wave = compile_level(self, self.waves or DEFAULT_WAVES, level, start, self.spawn_next)
+        self.spawn_index = 0
+    def update_spawns(self):
+        # Consome a linha do tempo do nível; ao fim dele, compila o próximo
+        now = self.elapsed_time + TIME_EPSILON
+        while True:
+            timeline = self.wave.timeline
+            while self.spawn_index < len(timeline) and timeline[self.spawn_index][0] <= now:
+                _, kind, params = timeline[self.spawn_index]
+                self.spawn_index += 1
+                getattr(self, 'spawn_' + kind)(*params)
+            if now < self.wave.end:
+                break
+            self.enter_level(self.level + 1, self.wave.end)
+    # ----- Entrada do jogador -----
+    def touch(self, x, y):
+        # Verifica se o toque atingiu um power-up
+        for powerup in self.powerups:
+            if math.hypot(x-powerup.pos[0], y-powerup.pos[1]) < 30:
+                if powerup.powerup_type == "bomb":
+                    self.activate_bomb(powerup)
+                elif powerup.powerup_type == "slow":
+                    self.activate_slow_motion(powerup)
+                self.flush_removals()
+                return
+        if self.game_over:
+            self.reset()
+            return
+        if self.fire_cooldown > 0 or not self.aa_bases:
+            return
+        base = min(self.aa_bases, key=lambda aa: distance(aa.pos, (x, y)))
+        self.add_interceptor(base.pos, (x, y))
+        self.fire_cooldown = self.FIRE_COOLDOWN_TIME
+    def activate_bomb(self, powerup):
+        self.powerups.kill(powerup)
+        # Ao ativar, explode todos os mísseis inimigos
+        enemies = self.enemy_missiles
+        for eid, x, y in enemies.items():
+            if eid in enemies:
+                self.add_explosion((x, y), self.INTERCEPTOR_EXPLOSION_RANGE)
+                self.score += 1
+        enemies.clear()
+        self.warnings.clear()
+    def activate_slow_motion(self, powerup):
+        self.powerups.kill(powerup)
+        self.slow_motion_active = True
+        self.slow_motion_timer = self.SLOW_MOTION_DURATION
+    # ----- Passo da simulação -----
+    # O passo é dividido em fases, nesta ordem; cada nome corresponde a um
+    # método phase_<nome>. Com um profiler ligado (self.profiler) cada fase é
+    # cronometrada; desligado, o custo extra é só o teste do if.
+    PHASES = ('spawns', 'enemies', 'warnings', 'interceptors', 'collisions',
+              'explosions', 'powerups', 'airplanes', 'game_over')
+    def step(self):
+        if self.profiler is not None:
+            self.profiler.run_step(self)
+            return
+        self.begin_step()
+        for name in self.PHASES:
+            self.phase = name
+            getattr(self, 'phase_' + name)()
+        self.phase = None
+    def begin_step(self):
+        self.dt = dt = self.tick_dt
+        self.tick += 1
+        self.time = self.tick * dt
+        self.elapsed_time += dt
+        if self.fire_cooldown > 0:
+            self.fire_cooldown -= dt
+        if self.slow_motion_active:
+            self.slow_motion_timer -= dt
+            if self.slow_motion_timer <= 0:
+                self.slow_motion_active = False
+        # Só os inimigos ficam mais lentos no slow motion
+        self.effective_dt = dt * (self.SLOW_MOTION_FACTOR if self.slow_motion_active else 1)
+        self.enemy_time += self.effective_dt
+    def phase_spawns(self):
+        self.update_spawns()
+    def phase_enemies(self):
+        enemies = self.enemy_missiles
+        enemies.move(self.effective_dt)
+        self.enemy_grid.build(enemies.x, enemies.y, enemies.eids)
+        self.fire_events('enemies')
+    def phase_warnings(self):
+        self.fire_events('warnings')
+    def phase_interceptors(self):
+        interceptors = self.interceptor_missiles
+        interceptors.move(self.dt)
+        self.fire_events('interceptors')
+        self.interceptor_grid.build(interceptors.x, interceptors.y, interceptors.eids)
+    def phase_collisions(self):
+        # Interceptores contra aviões e bombas, em teste contínuo: vale
+        # qualquer instante do passo em que chegaram perto, não só o fim dele
+        dt = self.dt
+        for bomb in self.bombs:
+            bomb.move(dt)
+        # O avião só anda na fase dele, mas em linha reta: o trecho deste
+        # passo já é conhecido
+        targets = [(airplane, airplane.pos, (airplane.pos[0] + airplane.speed*dt, airplane.pos[1]),
+                    AIRPLANE_HIT_RADIUS) for airplane in self.airplanes]
+        targets += [(bomb, bomb.prev_pos, bomb.pos, BOMB_HIT_RADIUS) for bomb in self.bombs]
+        for (target, _, _, _), eid in zip(targets, self.swept_interceptor_hits(targets)):
+            if eid is None:
+                continue
+            if isinstance(target, Airplane):
+                self.add_explosion(target.pos, self.INTERCEPTOR_EXPLOSION_RANGE)
+                self.airplanes.kill(target)
+            else:
+                self.add_explosion(target.pos, self.BOMB_EXPLOSION_RANGE)
+                self.score += 1
+                self.bombs.kill(target)
+            self.remove_missile(eid)
+        self.fire_events('collisions')
+    def phase_explosions(self):
+        active = []
+        for explosion in self.explosions:
+            if explosion.update(self.dt):
+                self.explosions.kill(explosion)
+            else:
+                active.append(explosion)
+        self.check_explosion_impacts(active)
+    def phase_powerups(self):
+        for powerup in self.powerups:
+            powerup.move(self.dt)
+        self.fire_events('powerups')
+    def phase_airplanes(self):
+        for airplane in self.airplanes:
+            airplane.move(self.dt)
+        self.fire_events('airplanes')
+    def phase_game_over(self):
+        self.flush_removals()
+        self.check_game_over()
+    def flush_removals(self):
+        # Aplica de uma vez as remoções marcadas durante o passo
+        self.enemy_missiles.flush()
+        self.interceptor_missiles.flush()
+        for registry in (self.explosions, self.cities, self.powerups, self.airplanes, self.bombs):
+            registry.flush()
+    def run(self, ticks):
+        for _ in range(ticks):
+            self.step()
+    # ----- Eventos agendados -----
+    def clock(self, phase):
+        # Instante, no relógio da fila `phase`, da posição atual de quem anda
+        # nela: se a fase de movimento ainda não rodou neste passo, o relógio
+        # já avançou mas a entidade ainda não
+        if phase in self.ENEMY_EVENT_PHASES:
+            now, dt, mover = self.enemy_time, self.effective_dt, 'enemies'
+        else:
+            now, dt, mover = self.time, self.dt, phase
+        if self.phase is not None and self.PHASES.index(self.phase) < self.PHASES.index(mover):
+            now -= dt
+        return now
+    def schedule(self, phase, delay, kind, eid, arg=None):
+        # Agenda o evento para daqui a `delay` segundos no relógio da fila
+        self.events[phase].schedule(self.clock(phase) + delay, kind, eid, arg)
+    def fire_events(self, phase):
+        # Dispara os eventos vencidos da fase; cada tipo é tratado por on_<tipo>,
+        # que ignora eventos de entidades que já morreram
+        now = self.enemy_time if phase in self.ENEMY_EVENT_PHASES else self.time
+        for kind, eid, arg in self.events[phase].pop_due(now + TIME_EPSILON):
+            getattr(self, 'on_' + kind)(eid, arg)
+    def schedule_enemies(self, eids):
+        # Para cada inimigo: quando atinge uma cidade (o caminho entre dois
+        # passos conta, então mísseis rápidos não "pulam" a cidade), quando
+        # entra no raio de aviso e, se não atinge nenhuma cidade viva, quando
+        # sai da tela
+        if not eids:
+            return
+        enemies = self.enemy_missiles
+        idx = np.array([enemies.index_of[eid] for eid in eids])
+        x, y = enemies.x[idx], enemies.y[idx]
+        vx = enemies.dx[idx] * enemies.speed[idx]
+        vy = enemies.dy[idx] * enemies.speed[idx]
+        hit = np.full(len(idx), np.inf)
+        hit_city = np.zeros(len(idx), dtype=np.int64)
+        warn = np.full(len(idx), np.inf)
+        for city in self.cities:
+            t = entry_time(x, y, vx, vy, city.pos[0], city.pos[1], CITY_RADIUS + MISSILE_RADIUS_ENEMY)
+            closer = t < hit
+            hit = np.where(closer, t, hit)
+            hit_city = np.where(closer, city.eid, hit_city)
+            warn = np.minimum(warn, entry_time(x, y, vx, vy, city.pos[0], city.pos[1], self.WARNING_DISTANCE))
+        with np.errstate(divide='ignore'):
+            leave = np.where(vy < 0, (y + MISSILE_RADIUS_ENEMY) / -vy, np.inf)
+        for eid, t, c, w, out in zip(eids, hit.tolist(), hit_city.tolist(), warn.tolist(), leave.tolist()):
+            if t != math.inf:
+                self.schedule('enemies', t, 'city_hit', eid, c)
+            elif out != math.inf:
+                self.schedule('enemies', out, 'enemy_exit', eid)
+            if w != math.inf:
+                # w == 0: já está no raio de aviso agora
+                self.schedule('warnings', w, 'warning', eid)
+    def reschedule_enemies(self):
+        # Uma cidade caiu: os tempos calculados contra ela não valem mais
+        enemies = self.enemy_missiles
+        self.events['enemies'].clear()
+        self.events['warnings'].clear()
+        self.warnings = set()
+        self.schedule_enemies([eid for eid in enemies.eids.tolist() if eid in enemies])
+        self.fire_events('warnings')
+    def on_city_hit(self, eid, city_eid):
+        city = self.cities.get(city_eid)
+        if eid not in self.enemy_missiles or city is None:
+            return
+        self.add_explosion(city.pos)
+        self.remove_missile(eid)
+        self.damage_city(city)
+    def on_enemy_exit(self, eid, _):
+        self.remove_missile(eid)
+    def on_warning(self, eid, _):
+        if eid in self.enemy_missiles:
+            self.warnings.add(eid)
+    def on_detonate(self, eid, at_target):
+        interceptors = self.interceptor_missiles
+        if eid not in interceptors:
+            return
+        if at_target:
+            # Explode exatamente no alvo, mesmo que o último passo tenha passado dele
+            pos = interceptors.target(eid)
+        else:
+            pos = interceptors.pos(eid)
+        self.add_explosion(pos, self.INTERCEPTOR_EXPLOSION_RANGE)
+        self.remove_missile(eid)
+    def on_bomb_impact(self, eid, _):
+        bomb = self.bombs.get(eid)
+        if bomb is None:
+            return
+        self.add_explosion(bomb.pos, self.BOMB_EXPLOSION_RANGE)
+        for city in self.cities:
+            if distance(bomb.pos, city.pos) < self.BOMB_EXPLOSION_RANGE:
+                self.damage_city(city)
+        self.bombs.kill(bomb)
+    def on_bomb_drop(self, eid, _):
+        airplane = self.airplanes.get(eid)
+        if airplane is None:
+            return
+        if self.cities:
+            # Escolhe a cidade mais próxima como alvo da bomba
+            target_city = min(self.cities, key=lambda city: distance(airplane.pos, city.pos))
+            self.add_bomb((airplane.pos[0]+25, airplane.pos[1]), target_city.pos)
+        self.schedule('airplanes', airplane.bomb_interval, 'bomb_drop', eid)
+    def on_airplane_exit(self, eid, _):
+        airplane = self.airplanes.get(eid)
+        if airplane is not None:
+            self.airplanes.kill(airplane)
+    def on_powerup_exit(self, eid, _):
+        powerup = self.powerups.get(eid)
+        if powerup is not None:
+            self.powerups.kill(powerup)
+    # ----- Colisões -----
+    def swept_interceptor_hits(self, targets):
+        # Para cada alvo (entidade, início, fim do trecho no passo, raio), o
+        # interceptor que encostou nele primeiro durante o passo, ou None.
+        # Cada interceptor derruba um alvo só, na ordem da lista
+        hits = [None] * len(targets)
+        interceptors = self.interceptor_missiles
+        grid = self.interceptor_grid
+        if not targets or not len(grid):
+            return hits
+        x0, y0, x1, y1, radius = (np.array(v, dtype=float) for v in
+                                  zip(*[(a[0], a[1], b[0], b[1], r) for _, a, b, r in targets]))
+        # Candidatos pela grade (posições finais), com folga para o quanto o
+        # alvo e o interceptor andaram; os índices da grade são os do store
+        # (nada é removido antes do fim do passo)
+        reach = np.hypot(x1-x0, y1-y0) + float(interceptors.speed.max()) * self.dt
+        target, point = grid.query_circles(x1, y1, radius + reach)
+        # Trecho do interceptor em relação ao alvo
+        hit, t = swept_hits(interceptors.px[point] - x0[target], interceptors.py[point] - y0[target],
+                            grid.x[point] - x1[target], grid.y[point] - y1[target], 0, 0, radius[target])
+        target, point, t = target[hit], point[hit], t[hit]
+        order = np.lexsort((point, t, target))
+        used = set()
+        for i, eid in zip(target[order].tolist(), grid.ids[point[order]].tolist()):
+            if hits[i] is None and eid not in used and eid in interceptors:
+                hits[i] = eid
+                used.add(eid)
+        return hits
+    def damage_city(self, city):
+        city.lives -= 1
+        if city.lives <= 0:
+            self.cities.kill(city)
+            self.reschedule_enemies()
+    def add_explosion(self, center, explosion_range=None):
+        if explosion_range is None:
+            explosion_range = self.BASE_EXPLOSION_RANGE
+        return self.explosions.add(Explosion(self.new_eid(), center, explosion_range))
+    def check_explosion_impacts(self, explosions):
+        if not explosions:
+            return
+        # Contínuo também: conta o míssil que passou pela explosão durante o
+        # passo, mesmo que no fim dele já esteja do outro lado
+        grid = self.enemy_grid
+        if not len(grid):
+            return
+        enemies = self.enemy_missiles
+        cx = np.array([e.center_point[0] for e in explosions], dtype=float)
+        cy = np.array([e.center_point[1] for e in explosions], dtype=float)
+        radius = np.array([e.radius for e in explosions], dtype=float)
+        reach = float(enemies.speed.max()) * self.effective_dt
+        circle, point = grid.query_circles(cx, cy, radius + reach)
+        hit, _ = swept_hits(enemies.px[point], enemies.py[point], grid.x[point], grid.y[point],
+                            cx[circle], cy[circle], radius[circle])
+        for eid in grid.ids[np.unique(point[hit])].tolist():
+            if eid in self.enemy_missiles:
+                self.score += 1
+                self.remove_missile(eid)
+    def remove_missile(self, eid):
+        if not self.enemy_missiles.kill(eid):
+            self.interceptor_missiles.kill(eid)
+        self.warnings.discard(eid)
+    def entity_count(self):
+        return (len(self.enemy_missiles) + len(self.interceptor_missiles) + len(self.explosions)
+                + len(self.cities) + len(self.powerups) + len(self.airplanes) + len(self.bombs))
+    def check_game_over(self):
+        if not self.cities:
+            self.game_over = True
@@ -0,0 +1,82 @@
+# Partículas das explosões num único sistema compartilhado: todas as
+# partículas vivas ficam nos mesmos arrays NumPy, posição/vida/alfa são
+# atualizados de forma vetorizada e as que morrem são removidas na hora (em
+# vez de ficarem invisíveis com alfa 0). Só visual, fora da simulação.
+import numpy as np
+
+PARTICLES_PER_EXPLOSION = 20
+MAX_PARTICLES = 4096
+PARTICLE_TINTS = 2  # Variações de cor (o renderizador define quais são)
+
+class ParticleSystem:
+    FIELDS = ('x', 'y', 'vx', 'vy', 'radius', 'life', 'max_life', 'tint')
+    def __init__(self, capacity=MAX_PARTICLES, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        for name in self.FIELDS:
+            setattr(self, '_' + name, np.zeros(capacity))
+        self._tint = np.zeros(capacity, dtype=np.int64)
+    def __len__(self):
+        return self.count
+    def field(self, name):
+        return getattr(self, '_' + name)[:self.count]
+    def emit(self, pos, count=PARTICLES_PER_EXPLOSION):
+        # Sem espaço, as partículas extras são simplesmente descartadas
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        rng = self.rng
+        s = slice(self.count, self.count + count)
+        speed = rng.uniform(30, 60, count)
+        self._x[s] = pos[0]
+        self._y[s] = pos[1]
+        self._vx[s] = rng.uniform(-1, 1, count) * speed
+        self._vy[s] = rng.uniform(-1, 1, count) * speed
+        self._radius[s] = rng.uniform(2, 4, count)
+        self._life[s] = self._max_life[s] = rng.uniform(0.5, 1.0, count)
+        self._tint[s] = rng.integers(0, PARTICLE_TINTS, count)
+        self.count += count
+    def update(self, dt):
+        n = self.count
+        self._x[:n] += self._vx[:n] * dt
+        self._y[:n] += self._vy[:n] * dt
+        self._life[:n] -= dt
+        alive = self._life[:n] > 0
+        if alive.all():
+            return
+        # Compacta os arrays mantendo só as partículas vivas
+        k = int(alive.sum())
+        for name in self.FIELDS:
+            arr = getattr(self, '_' + name)
+            arr[:k] = arr[:n][alive]
+        self.count = k
+    def alpha(self):
+        return np.clip(self.field('life') / self.field('max_life'), 0, 1)
+    def clear(self):
+        self.count = 0
+
+# ----- Geometria para desenho em lote -----
+_QUAD_UV = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+_QUAD_INDICES = np.array([0, 1, 2, 2, 3, 0], dtype=np.uint16)
+
+def quad_vertices(x, y, half_w, half_h=None, uv=_QUAD_UV):
+    # Um retângulo (4 vértices x, y, u, v) centrado em cada (x, y), em um
+    # array float32 pronto para Mesh.vertices; sem half_h, um quadrado.
+    # uv: coordenadas de textura dos cantos (ex.: Texture.tex_coords)
+    if half_h is None:
+        half_h = half_w
+    n = len(x)
+    verts = np.empty((n, 4, 4), dtype=np.float32)
+    x0, x1 = x - half_w, x + half_w
+    y0, y1 = y - half_h, y + half_h
+    verts[:, 0, 0] = x0; verts[:, 0, 1] = y0
+    verts[:, 1, 0] = x1; verts[:, 1, 1] = y0
+    verts[:, 2, 0] = x1; verts[:, 2, 1] = y1
+    verts[:, 3, 0] = x0; verts[:, 3, 1] = y1
+    verts[:, :, 2:] = uv
+    return verts.reshape(-1)
+
+def quad_indices(n):
+    # Índices dos triângulos de n quadrados (uint16: até 16383 por Mesh)
+    return (_QUAD_INDICES[None, :] + 4 * np.arange(n, dtype=np.uint16)[:, None]).reshape(-1)
@@ -0,0 +1,57 @@
+# Jogadores automáticos para rodar partidas sem janela (benchmarks, ajuste de
+# dificuldade). Uma política é chamada uma vez por passo, antes do step(), e
+# age sobre a simulação só pelo sim.touch(), como um jogador faria.
+import math
+
+import numpy as np
+
+class IdlePolicy:
+    # Não faz nada: só deixa o jogo correr
+    def __call__(self, sim):
+        pass
+
+class InterceptPolicy:
+    # Mira no míssil inimigo mais baixo ainda não visado, prevendo onde ele
+    # vai estar quando o interceptor chegar (interceptor_speed=None: a
+    # velocidade configurada na simulação)
+    def __init__(self, interceptor_speed=None, use_powerups=True):
+        self.interceptor_speed = interceptor_speed
+        self.use_powerups = use_powerups
+        self.targeted = set()
+    def __call__(self, sim):
+        if sim.game_over:
+            return
+        if self.use_powerups:
+            for powerup in sim.powerups:
+                sim.touch(*powerup.pos)
+                return
+        if sim.fire_cooldown > 0 or not sim.aa_bases:
+            return
+        enemies = sim.enemy_missiles
+        if not len(enemies):
+            return
+        self.targeted.intersection_update(enemies.eids.tolist())
+        candidates = [i for i in np.argsort(enemies.y).tolist()
+                      if int(enemies.eids[i]) in enemies and int(enemies.eids[i]) not in self.targeted]
+        if not candidates:
+            return
+        i = candidates[0]
+        self.targeted.add(int(enemies.eids[i]))
+        sim.touch(*self.aim(sim, i))
+    def aim(self, sim, i):
+        enemies = sim.enemy_missiles
+        x, y = float(enemies.x[i]), float(enemies.y[i])
+        # Velocidade do inimigo por segundo de simulação (mais lento no slow motion)
+        rate = float(enemies.speed[i]) * (sim.SLOW_MOTION_FACTOR if sim.slow_motion_active else 1)
+        vx = float(enemies.dx[i]) * rate
+        vy = float(enemies.dy[i]) * rate
+        base = min(sim.aa_bases, key=lambda aa: math.hypot(aa.pos[0]-x, aa.pos[1]-y))
+        # Algumas iterações de ponto fixo bastam para convergir
+        speed = self.interceptor_speed or sim.INTERCEPTOR_SPEED
+        px, py = x, y
+        for _ in range(3):
+            t = math.hypot(px - base.pos[0], py - base.pos[1]) / speed
+            px, py = x + vx*t, y + vy*t
+        return px, py
+
+POLICIES = {'idle': IdlePolicy, 'intercept': InterceptPolicy}
@@ -0,0 +1,31 @@
+# Pool genérico de objetos reaproveitáveis (widgets e instruções de canvas).
+# Em vez de criar um widget novo a cada spawn e jogar fora na remoção, o jogo
+# pega um objeto livre do pool e devolve depois, evitando alocações e pausas
+# do coletor de lixo em picos (ex.: a bomba explodindo todos os inimigos).
+class Pool:
+    def __init__(self, factory, prefill=0, max_free=64):
+        self.factory = factory
+        self.max_free = max_free  # Quantos objetos livres guardar no máximo
+        self.free = [factory() for _ in range(prefill)]
+        self.hits = 0    # acquire atendido por um objeto reaproveitado
+        self.misses = 0  # acquire que precisou criar um objeto novo
+        self.dropped = 0 # release descartado porque o pool estava cheio
+    def acquire(self):
+        if self.free:
+            self.hits += 1
+            return self.free.pop()
+        self.misses += 1
+        return self.factory()
+    def reserve(self, n):
+        # Pré-aloca até `n` objetos livres (limitado a max_free), fora do
+        # caminho crítico; ex.: os mísseis de uma onda antes de ela começar
+        while len(self.free) < min(n, self.max_free):
+            self.free.append(self.factory())
+    def release(self, obj):
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+        else:
+            self.dropped += 1
+    def stats(self):
+        return {'free': len(self.free), 'hits': self.hits,
+                'misses': self.misses, 'dropped': self.dropped}
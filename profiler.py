@@ -0,0 +1,122 @@
+# Instrumentação opcional por quadro da simulação.
+#
+# Com sim.profiler = FrameProfiler(), cada step() passa a ser cronometrado
+# fase a fase (MissileCommandSim.PHASES) e gera uma linha com os tempos, a
+# contagem de entidades e as alocações do passo. Quem desenha (a camada Kivy)
+# envolve cada quadro em begin_frame()/end_frame(): os passos do quadro (zero,
+# um ou vários, já que a simulação e o desenho têm frequências próprias) viram
+# uma linha só, somados, com os números do desenho acrescentados.
+# Desligado (sim.profiler = None) o custo é só um if por passo.
+import csv
+import json
+import math
+import sys
+from collections import deque
+from time import perf_counter
+
+def percentile(values, q):
+    # Percentil pelo método "nearest rank"; values já ordenados
+    if not values:
+        return 0.0
+    k = max(0, math.ceil(q/100 * len(values)) - 1)
+    return values[k]
+
+class FrameProfiler:
+    def __init__(self, window=300, keep_trace=False):
+        self.window = deque(maxlen=window)  # Últimas linhas (para os percentis)
+        self.keep_trace = keep_trace
+        self.trace = []  # Todas as linhas, se keep_trace
+        self.frame_rows = None  # Passos do quadro em andamento (entre begin_frame e end_frame)
+    def run_step(self, sim):
+        eids_before = sim._next_eid
+        blocks_before = sys.getallocatedblocks()
+        start = t = perf_counter()
+        sim.begin_step()
+        row = {'tick': sim.tick}
+        for name in sim.PHASES:
+            sim.phase = name
+            getattr(sim, 'phase_' + name)()
+            now = perf_counter()
+            row[name] = (now - t) * 1000
+            t = now
+        sim.phase = None
+        row['step'] = (t - start) * 1000
+        row['entities'] = sim.entity_count()
+        row['spawned'] = sim._next_eid - eids_before
+        row['alloc_blocks'] = sys.getallocatedblocks() - blocks_before
+        if self.frame_rows is None:
+            self.record(row)
+        else:
+            self.frame_rows.append(row)
+    def record(self, row):
+        self.window.append(row)
+        if self.keep_trace:
+            self.trace.append(row)
+    def begin_frame(self):
+        self.frame_rows = []
+    def end_frame(self, sim, **values):
+        # Uma linha por quadro: tempos e contagens dos passos do quadro somados
+        # (zero se nenhum passo rodou) mais os valores do desenho (ex.: tempo
+        # de render, widgets criados)
+        steps, self.frame_rows = self.frame_rows or [], None
+        row = {'tick': sim.tick}
+        for key in sim.PHASES + ('step', 'spawned', 'alloc_blocks'):
+            row[key] = sum(step[key] for step in steps)
+        row['entities'] = sim.entity_count()
+        row['steps'] = len(steps)
+        row.update(values)
+        self.record(row)
+    def percentiles(self, key, qs=(50, 95, 99), rows=None):
+        values = sorted(row[key] for row in (self.window if rows is None else rows) if key in row)
+        return tuple(percentile(values, q) for q in qs)
+    def snapshot(self):
+        # Cópia das linhas da janela, para calcular o resumo em outro thread
+        # enquanto o jogo continua acrescentando linhas
+        return [dict(row) for row in self.window]
+    def summary(self, rows=None):
+        rows = self.window if rows is None else rows
+        keys = []
+        for row in rows:
+            keys.extend(k for k in row if k != 'tick' and k not in keys)
+        return {key: self.percentiles(key, rows=rows) for key in keys}
+    def columns(self):
+        rows = self.trace or list(self.window)
+        columns = []
+        for row in rows:
+            columns.extend(k for k in row if k not in columns)
+        return rows, columns
+    def dump(self, path):
+        # Grava as linhas em CSV ou JSON, conforme a extensão do arquivo
+        rows, columns = self.columns()
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.json'):
+                json.dump(rows, f)
+            else:
+                writer = csv.DictWriter(f, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(rows)
+
+class StartupTimer:
+    # Marcos do início do app, em ms desde `start` (perf_counter), comparados
+    # com um orçamento {marco: ms}. Usado em "Missele Command.py"
+    def __init__(self, budget=None, start=None):
+        self.start = perf_counter() if start is None else start
+        self.budget = dict(budget or {})
+        self.marks = {}
+    def mark(self, name):
+        self.marks[name] = (perf_counter() - self.start) * 1000
+        return self.marks[name]
+    def over_budget(self):
+        # {marco: (ms, limite)} dos marcos que passaram do orçamento
+        return {name: (self.marks[name], limit) for name, limit in self.budget.items()
+                if name in self.marks and self.marks[name] > limit}
+    def report(self):
+        lines = []
+        for name, ms in self.marks.items():
+            limit = self.budget.get(name)
+            status = '' if limit is None else f" (orçamento {limit:.0f} ms{', ESTOUROU' if ms > limit else ''})"
+            lines.append(f"{name} {ms:.1f} ms{status}")
+        return lines
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump({'marks': self.marks, 'budget': self.budget}, f, indent=1)
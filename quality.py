@@ -0,0 +1,89 @@
+# Qualidade visual adaptativa, guiada pelo tempo medido dos quadros.
+#
+# A cada quadro o jogo informa quanto tempo o update() levou (trabalho da
+# CPU: simulação + sincronizar widgets) e o intervalo desde o quadro anterior.
+# Com uma janela cheia de amostras o QualityScaler decide:
+#   - trabalho (p90) acima da fatia do quadro reservada para ele, ou
+#     intervalo (mediana) acima do orçamento com folga: desce um nível;
+#   - trabalho abaixo de RECOVER_AT da fatia e quadros em dia: sobe um nível.
+# Cada janela é avaliada uma vez e recomeça; subir logo de novo para o nível
+# que acabou de falhar espera cada vez mais (evita ficar oscilando).
+#
+# Só o desenho muda de nível para nível; a simulação é a mesma em qualquer
+# aparelho (replays e partidas em lote continuam valendo).
+from collections import deque
+
+from particles import PARTICLES_PER_EXPLOSION
+
+class QualityTier:
+    def __init__(self, name, particles, particle_every, merge_explosions, warning_every):
+        self.name = name
+        self.particles = particles                # Partículas por explosão
+        self.particle_every = particle_every      # Atualiza as partículas a cada N quadros
+        self.merge_explosions = merge_explosions  # Explosão sobre outra não ganha widget próprio
+        self.warning_every = warning_every        # Atualiza os "!" a cada N quadros
+
+# Do melhor para o pior
+TIERS = (
+    QualityTier('alta', PARTICLES_PER_EXPLOSION, 1, False, 1),
+    QualityTier('média', PARTICLES_PER_EXPLOSION // 2, 1, True, 2),
+    QualityTier('baixa', PARTICLES_PER_EXPLOSION // 4, 2, True, 3),
+    QualityTier('mínima', 0, 2, True, 4),
+)
+
+WORK_SHARE = 0.5     # Fatia do quadro para o update(); o resto é do desenho
+FRAME_SLACK = 1.2    # Intervalo aceito antes de contar como quadro atrasado
+RECOVER_AT = 0.6     # Trabalho abaixo desta fração da fatia: há folga
+MAX_BACKOFF = 16     # Espera máxima (em janelas) para voltar a um nível que falhou
+
+def median_and_p90(values):
+    ordered = sorted(values)
+    n = len(ordered)
+    return ordered[n // 2], ordered[min(n - 1, (n * 9) // 10)]
+
+class QualityScaler:
+    def __init__(self, target_fps=60, window=60, tiers=TIERS, fixed=None):
+        self.frame_budget = 1000 / target_fps   # ms por quadro
+        self.work_budget = self.frame_budget * WORK_SHARE
+        self.window = window
+        self.tiers = tiers
+        self.fixed = fixed is not None          # Nível fixo (MC_QUALITY): não se ajusta
+        self.level = min(max(fixed or 0, 0), len(tiers) - 1)
+        self.work = deque(maxlen=window)        # ms de update() por quadro
+        self.frames = deque(maxlen=window)      # ms entre quadros
+        self.backoff = [1] * len(tiers)         # Janelas de espera para subir a cada nível
+        self.waited = 0                         # Janelas seguidas com folga
+        self.changes = 0
+    @property
+    def tier(self):
+        return self.tiers[self.level]
+    def record(self, work_ms, frame_ms):
+        # Devolve True se o nível mudou neste quadro
+        if self.fixed:
+            return False
+        self.work.append(work_ms)
+        self.frames.append(frame_ms)
+        if len(self.work) < self.window:
+            return False
+        frame_median, _ = median_and_p90(self.frames)
+        _, work_p90 = median_and_p90(self.work)
+        late = frame_median > self.frame_budget * FRAME_SLACK
+        self.work.clear()
+        self.frames.clear()
+        if (late or work_p90 > self.work_budget) and self.level < len(self.tiers) - 1:
+            # O nível atual não aguentou: voltar para ele vai demorar mais
+            self.backoff[self.level] = min(self.backoff[self.level] * 2, MAX_BACKOFF)
+            return self.change(self.level + 1)
+        if not late and work_p90 < self.work_budget * RECOVER_AT and self.level > 0:
+            # Sobe depois de `backoff` janelas seguidas com folga
+            self.waited += 1
+            if self.waited >= self.backoff[self.level - 1]:
+                return self.change(self.level - 1)
+        else:
+            self.waited = 0
+        return False
+    def change(self, level):
+        self.level = level
+        self.changes += 1
+        self.waited = 0
+        return True
@@ -0,0 +1,226 @@
+# Gravação e reprodução de partidas.
+#
+# A simulação é determinística (seed, tamanho da tela, frequência,
+# constantes e ondas fixam tudo), então basta gravar esses parâmetros e os toques,
+# cada um com o tick em que aconteceu, num arquivo binário pequeno (8 bytes
+# por toque). A cada CHECKSUM_INTERVAL ticks também vai um checksum do
+# estado, para a reprodução apontar o primeiro tick em que divergiu.
+#
+# Formato (little-endian):
+#   cabeçalho: MAGIC, seed (u32), tick_rate, largura, altura (u16), número
+#              de constantes trocadas (u8), e cada uma como nome (u8 +
+#              bytes) e valor (f64); por fim o tamanho (u32) e o JSON da
+#              definição de ondas (tamanho 0: as ondas padrão)
+#   registros: tick (u32), x, y (u16, em 1/COORD_SCALE de pixel). Se x é
+#              MARK_CHECKSUM, o checksum (u32) vem em y (metade alta) e num
+#              u16 extra (metade baixa); MARK_END fecha o arquivo
+#
+#   python replay.py partida.mcr            # re-simula tudo, sem janela
+#   python replay.py partida.mcr --seek 95  # estado no segundo 95
+import argparse
+import json
+import pickle
+import struct
+import sys
+import time
+import zlib
+
+from missile_core import MissileCommandSim
+
+MAGIC = b'MCR2'
+HEADER = struct.Struct('<4sIHHHB')
+OVERRIDE_VALUE = struct.Struct('<d')
+WAVES_SIZE = struct.Struct('<I')
+RECORD = struct.Struct('<IHH')
+CHECKSUM_LOW = struct.Struct('<H')  # Metade baixa do checksum, depois do registro
+COORD_SCALE = 8          # Toques guardados com resolução de 1/8 px
+MARK_CHECKSUM = 0xFFFE   # Valores de x reservados para registros especiais
+MARK_END = 0xFFFF
+CHECKSUM_INTERVAL = 600  # Ticks entre checksums gravados
+SNAPSHOT_INTERVAL = 600  # Ticks entre cópias do estado guardadas para o seek
+FLUSH_SIZE = 4096        # Bytes acumulados antes de mandar para o arquivo (além de a cada checksum)
+
+def quantize(value):
+    return min(max(round(value * COORD_SCALE), 0), MARK_CHECKSUM - 1)
+
+def state_checksum(sim):
+    # Resumo do estado que importa para a partida (posições dos mísseis,
+    # pontos, entidades vivas); igual nas duas pontas se nada divergiu
+    crc = zlib.crc32(struct.pack('<qqqq', sim.tick, sim.score, sim.entity_count(), sim._next_eid))
+    for store in (sim.enemy_missiles, sim.interceptor_missiles):
+        crc = zlib.crc32(store.x.tobytes(), crc)
+        crc = zlib.crc32(store.y.tobytes(), crc)
+    return crc
+
+# Os registros vão para um buffer em memória e são escritos no arquivo em
+# blocos, a cada checksum ou FLUSH_SIZE bytes (e no flush() do on_pause):
+# se o app for morto ou quebrar, o arquivo tem a partida até ali. Com um
+# worker (background.BackgroundWorker) a escrita sai do thread do jogo, na
+# mesma ordem
+class ReplayRecorder:
+    def __init__(self, path, sim, worker=None):
+        self.worker = worker
+        self.buffer = bytearray()
+        self.file = open(path, 'wb')
+        overrides = {name: getattr(sim, name) for name in sim.overrides}
+        self.file.write(HEADER.pack(MAGIC, sim.seed, sim.tick_rate, int(sim.width), int(sim.height),
+                                    len(overrides)))
+        for name, value in overrides.items():
+            encoded = name.encode()
+            self.file.write(bytes([len(encoded)]) + encoded + OVERRIDE_VALUE.pack(value))
+        waves = json.dumps(sim.waves).encode() if sim.waves is not None else b''
+        self.buffer += WAVES_SIZE.pack(len(waves)) + waves
+        self.sim = sim
+    def touch(self, x, y):
+        # Grava o toque (antes do próximo passo) e devolve a posição como
+        # ficou no arquivo: é ela que deve ir para sim.touch(), senão o jogo
+        # e a reprodução divergem pelo arredondamento
+        qx, qy = quantize(x), quantize(y)
+        self.buffer += RECORD.pack(self.sim.tick, qx, qy)
+        return qx / COORD_SCALE, qy / COORD_SCALE
+    def step(self):
+        # Chamado depois de cada sim.step()
+        tick = self.sim.tick
+        if tick % CHECKSUM_INTERVAL == 0:
+            crc = state_checksum(self.sim)
+            self.buffer += RECORD.pack(tick, MARK_CHECKSUM, crc >> 16) + CHECKSUM_LOW.pack(crc & 0xFFFF)
+            self.flush()
+        elif len(self.buffer) >= FLUSH_SIZE:
+            self.flush()
+    def flush(self):
+        if not self.buffer or self.file.closed:
+            return
+        data, self.buffer = bytes(self.buffer), bytearray()
+        if self.worker is None:
+            self.write(data)
+        else:
+            self.worker.submit(self.write, data)
+    def write(self, data):
+        # Passa também pelo buffer do arquivo: o que foi escrito chega ao sistema
+        self.file.write(data)
+        self.file.flush()
+    def close(self):
+        # Espera a escrita terminar: depois disto o arquivo está completo
+        if self.file.closed:
+            return
+        self.buffer += RECORD.pack(self.sim.tick, MARK_END, 0)
+        self.flush()
+        if self.worker is None:
+            self.file.close()
+        else:
+            self.worker.submit(self.file.close).result()
+
+class Replay:
+    # Conteúdo de um arquivo gravado
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, self.seed, self.tick_rate, self.width, self.height, n = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: não é uma partida gravada")
+        offset = HEADER.size
+        self.overrides = {}
+        for _ in range(n):
+            size = data[offset]
+            name = data[offset+1:offset+1+size].decode()
+            offset += 1 + size
+            self.overrides[name], = OVERRIDE_VALUE.unpack_from(data, offset)
+            offset += OVERRIDE_VALUE.size
+        size, = WAVES_SIZE.unpack_from(data, offset)
+        offset += WAVES_SIZE.size
+        self.waves = json.loads(data[offset:offset+size]) if size else None
+        offset += size
+        self.touches = []    # (tick, x, y)
+        self.checksums = {}  # tick -> checksum
+        self.end_tick = None
+        while offset + RECORD.size <= len(data):
+            tick, x, y = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            if x == MARK_CHECKSUM:
+                low, = CHECKSUM_LOW.unpack_from(data, offset)
+                offset += CHECKSUM_LOW.size
+                self.checksums[tick] = (y << 16) | low
+            elif x == MARK_END:
+                self.end_tick = tick
+                break
+            else:
+                self.touches.append((tick, x / COORD_SCALE, y / COORD_SCALE))
+        if self.end_tick is None:
+            # Gravação interrompida: vai até o último registro conhecido
+            self.end_tick = max([t for t, _, _ in self.touches] + list(self.checksums) + [0])
+    def new_sim(self):
+        return MissileCommandSim(self.width, self.height, seed=self.seed, tick_rate=self.tick_rate,
+                                 overrides=self.overrides, waves=self.waves)
+
+class ReplayPolicy:
+    # Repete os toques gravados, cada um antes do passo seguinte ao tick em
+    # que aconteceu; serve como política nos benchmarks (benchmarks.harness)
+    def __init__(self, touches):
+        self.touches = touches
+        self.next = 0
+    def __call__(self, sim):
+        touches = self.touches
+        while self.next < len(touches) and touches[self.next][0] <= sim.tick:
+            _, x, y = touches[self.next]
+            sim.touch(x, y)
+            self.next += 1
+
+class ReplayPlayer:
+    def __init__(self, replay, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = {}   # tick -> estado (sim + posição nos toques) serializado
+        self.mismatches = []  # ticks cujo checksum difere do gravado
+        self.restore(None)
+    def restore(self, tick):
+        if tick is None:
+            self.sim = self.replay.new_sim()
+            self.policy = ReplayPolicy(self.replay.touches)
+        else:
+            self.sim, self.policy = pickle.loads(self.snapshots[tick])
+    def step(self):
+        sim = self.sim
+        if sim.tick % self.snapshot_interval == 0 and sim.tick not in self.snapshots:
+            self.snapshots[sim.tick] = pickle.dumps((sim, self.policy))
+        self.policy(sim)
+        sim.step()
+        expected = self.replay.checksums.get(sim.tick)
+        if expected is not None and state_checksum(sim) != expected:
+            self.mismatches.append(sim.tick)
+    def run(self, until=None):
+        until = self.replay.end_tick if until is None else until
+        while self.sim.tick < until:
+            self.step()
+        return self.sim
+    def seek(self, tick):
+        # Volta para a cópia guardada mais próxima antes de `tick` (ou segue
+        # em frente, se já está antes dele) e re-simula o resto
+        if self.sim.tick > tick or any(self.sim.tick < t <= tick for t in self.snapshots):
+            saved = [t for t in self.snapshots if t <= tick]
+            self.restore(max(saved) if saved else None)
+        return self.run(tick)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz uma partida gravada (MC_RECORD) sem janela")
+    parser.add_argument('path')
+    parser.add_argument('--seek', type=float, help="para no segundo indicado da partida")
+    args = parser.parse_args(argv)
+
+    replay = Replay(args.path)
+    player = ReplayPlayer(replay)
+    until = replay.end_tick if args.seek is None else round(args.seek * replay.tick_rate)
+    start = time.perf_counter()
+    sim = player.run(until)
+    elapsed = time.perf_counter() - start
+    print(f"seed {replay.seed}, {replay.width}x{replay.height}, {replay.tick_rate} Hz, "
+          f"{len(replay.touches)} toques, {replay.end_tick} ticks gravados")
+    print(f"tick {sim.tick} ({sim.tick / max(elapsed, 1e-9):.0f} ticks/s): pontos {sim.score}, "
+          f"nível {sim.level}, cidades {len(sim.cities)}, entidades {sim.entity_count()}")
+    if player.mismatches:
+        print(f"DIVERGÊNCIA: checksum diferente a partir do tick {player.mismatches[0]}")
+        return 1
+    print(f"{sum(1 for t in replay.checksums if t <= sim.tick)} checksums conferidos")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
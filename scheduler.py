@@ -0,0 +1,25 @@
+# Fila de eventos da simulação, ordenada pelo tempo (heap).
+#
+# Guarda (instante, tipo, eid, argumento) e devolve os vencidos em ordem.
+# Eventos de entidades que já morreram são ignorados por quem os trata (o
+# eid nunca é reaproveitado).
+import heapq
+
+class EventScheduler:
+    def __init__(self):
+        self.queue = []
+        self._seq = 0  # Desempate estável para eventos no mesmo tempo
+    def __len__(self):
+        return len(self.queue)
+    def schedule(self, time, kind, eid, arg=None):
+        self._seq += 1
+        heapq.heappush(self.queue, (time, self._seq, kind, eid, arg))
+    def pop_due(self, now):
+        # Remove e devolve (kind, eid, arg) de cada evento com tempo <= now,
+        # em ordem de tempo (e de agendamento, no empate)
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            _, _, kind, eid, arg = heapq.heappop(queue)
+            yield kind, eid, arg
+    def clear(self):
+        self.queue.clear()
@@ -0,0 +1,73 @@
+# Grade uniforme (spatial hash) para as consultas de colisão da simulação.
+# Os pontos são agrupados por célula uma vez por passo (build) e cada consulta
+# de círculo só olha as células que o círculo cobre, então o custo cresce com
+# o número de candidatos próximos e não com N*M. Tudo vetorizado em NumPy:
+# várias consultas de uma vez (query_circles) viram poucas chamadas.
+import numpy as np
+
+GRID_CELL_SIZE = 64
+_KEY_OFFSET = 1 << 20  # células negativas (fora da tela) também têm chave válida
+
+def _cell_keys(cx, cy):
+    return (cx + _KEY_OFFSET) * (2 * _KEY_OFFSET) + (cy + _KEY_OFFSET)
+
+class SpatialHash:
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = float(cell_size)
+        self.build(np.zeros(0), np.zeros(0))
+    def __len__(self):
+        return len(self.x)
+    def build(self, x, y, ids=None):
+        # Copia as posições (e os ids): a grade continua válida mesmo se os
+        # arrays de origem forem alterados (remoções) durante o passo
+        self.x = np.array(x, dtype=float)
+        self.y = np.array(y, dtype=float)
+        self.ids = np.arange(len(self.x)) if ids is None else np.array(ids)
+        cx = np.floor(self.x / self.cell_size).astype(np.int64)
+        cy = np.floor(self.y / self.cell_size).astype(np.int64)
+        keys = _cell_keys(cx, cy)
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+    def query_circles(self, cx, cy, radius):
+        # Retorna (índice do círculo, índice do ponto) de todos os pares com
+        # distância < raio, ordenados pelo círculo e depois pelo ponto
+        empty = np.zeros(0, dtype=np.int64)
+        if not len(self.x) or not len(cx):
+            return empty, empty
+        cx = np.asarray(cx, dtype=float)
+        cy = np.asarray(cy, dtype=float)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), cx.shape)
+        size = self.cell_size
+        x0 = np.floor((cx - radius) / size).astype(np.int64)
+        x1 = np.floor((cx + radius) / size).astype(np.int64)
+        y0 = np.floor((cy - radius) / size).astype(np.int64)
+        y1 = np.floor((cy + radius) / size).astype(np.int64)
+        # Enumera as células cobertas por cada círculo
+        nx = x1 - x0 + 1
+        ny = y1 - y0 + 1
+        ncells = nx * ny
+        circle = np.repeat(np.arange(len(cx)), ncells)
+        local = np.arange(len(circle)) - np.repeat(np.cumsum(ncells) - ncells, ncells)
+        cell_x = x0[circle] + local // ny[circle]
+        cell_y = y0[circle] + local % ny[circle]
+        keys = _cell_keys(cell_x, cell_y)
+        lo = np.searchsorted(self.sorted_keys, keys, 'left')
+        hi = np.searchsorted(self.sorted_keys, keys, 'right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            return empty, empty
+        # Expande cada faixa [lo, hi) em candidatos (círculo, ponto)
+        cand_circle = np.repeat(circle, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        cand_point = self.order[np.repeat(lo, counts) + offsets]
+        dx = self.x[cand_point] - cx[cand_circle]
+        dy = self.y[cand_point] - cy[cand_circle]
+        hit = dx*dx + dy*dy < radius[cand_circle]**2
+        cand_circle = cand_circle[hit]
+        cand_point = cand_point[hit]
+        order = np.lexsort((cand_point, cand_circle))
+        return cand_circle[order], cand_point[order]
+    def query_circle(self, center, radius):
+        # Índices (crescentes) dos pontos a menos de `radius` de `center`
+        return self.query_circles([center[0]], [center[1]], radius)[1]
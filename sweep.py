@@ -0,0 +1,42 @@
+# Cálculos analíticos de movimento em linha reta contra círculos: quando um
+# ponto p + v*t entra (ou sai) de um círculo, e se um trecho percorrido num
+# passo chegou a tocar um. Tudo aceita arrays NumPy (com broadcast) ou
+# escalares.
+import numpy as np
+
+def circle_interval(px, py, vx, vy, cx, cy, radius):
+    # Intervalo (t_in, t_out) em que p + v*t fica a menos de `radius` do
+    # centro c. Sem interseção, devolve (inf, inf). O intervalo pode começar
+    # no passado (t_in < 0) se o ponto já está dentro do círculo.
+    dx = np.asarray(px, dtype=float) - cx
+    dy = np.asarray(py, dtype=float) - cy
+    a = np.asarray(vx, dtype=float)**2 + np.asarray(vy, dtype=float)**2
+    b = 2 * (dx*vx + dy*vy)
+    c = dx*dx + dy*dy - np.asarray(radius, dtype=float)**2
+    disc = b*b - 4*a*c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = np.sqrt(np.maximum(disc, 0))
+        t_in = (-b - root) / (2*a)
+        t_out = (-b + root) / (2*a)
+    # Parado (a == 0): dentro para sempre ou nunca
+    still = a == 0
+    t_in = np.where(still, np.where(c < 0, -np.inf, np.inf), t_in)
+    t_out = np.where(still, np.inf, t_out)
+    miss = ~still & (disc <= 0)
+    t_in = np.where(miss, np.inf, t_in)
+    t_out = np.where(miss, np.inf, t_out)
+    return t_in, t_out
+
+def entry_time(px, py, vx, vy, cx, cy, radius):
+    # Tempo até p + v*t tocar o círculo: 0 se já está dentro, inf se nunca
+    # toca (ou se o círculo ficou para trás)
+    t_in, t_out = circle_interval(px, py, vx, vy, cx, cy, radius)
+    return np.where(t_out > 0, np.maximum(t_in, 0), np.inf)
+
+def swept_hits(x0, y0, x1, y1, cx, cy, radius):
+    # Se o ponto que foi de (x0, y0) a (x1, y1) em linha reta durante o passo
+    # chegou a menos de `radius` de c em algum instante (t de 0 a 1). Com os
+    # dois se movendo, passe a posição relativa (a - b) e c = 0. Devolve
+    # (acertou, t do primeiro contato)
+    t_in, t_out = circle_interval(x0, y0, np.subtract(x1, x0), np.subtract(y1, y0), cx, cy, radius)
+    return (t_in <= 1) & (t_out >= 0), np.maximum(t_in, 0)
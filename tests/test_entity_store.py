@@ -0,0 +1,44 @@
+import pytest
+
+from entity_store import EntityRegistry, MissileStore
+
+class Record:
+    def __init__(self, eid):
+        self.eid = eid
+
+def check_store(store, expected):
+    # index_of e os arrays contam a mesma história depois do flush
+    assert len(store) == store.count == len(expected)
+    assert sorted(store.eids.tolist()) == sorted(expected)
+    for eid in expected:
+        i = store.index_of[eid]
+        assert store.eids[i] == eid
+        assert store.pos(eid) == (eid * 10.0, eid * 20.0)
+        assert store.target(eid) == (eid * 10.0, 0.0)
+
+@pytest.mark.parametrize('dead', [{3, 4, 5}, {6, 7, 8}, {1, 2}, {2, 3, 7, 8}, set(range(1, 9))])
+def test_missile_store_flush_adjacent(dead):
+    store = MissileStore('enemy', capacity=4)  # Também passa pelo grow()
+    for eid in range(1, 9):
+        store.add(eid, (eid * 10.0, eid * 20.0), (eid * 10.0, 0.0), 100)
+    for eid in dead:
+        assert store.kill(eid)
+        assert eid not in store
+    assert not store.kill(min(dead))  # Já marcado
+    store.flush()
+    check_store(store, [eid for eid in range(1, 9) if eid not in dead])
+
+@pytest.mark.parametrize('dead', [{3, 4, 5}, {6, 7, 8}, {1, 2}, {2, 3, 7, 8}, set(range(1, 9))])
+def test_registry_flush_adjacent(dead):
+    registry = EntityRegistry()
+    records = {eid: registry.add(Record(eid)) for eid in range(1, 9)}
+    for eid in dead:
+        assert registry.kill(records[eid])
+        assert registry.get(eid) is None
+    registry.flush()
+    alive = [eid for eid in range(1, 9) if eid not in dead]
+    assert len(registry) == len(registry.items) == len(alive)
+    assert sorted(entity.eid for entity in registry) == alive
+    for eid in alive:
+        assert registry.items[registry.index_of[eid]] is records[eid]
+        assert registry.get(eid) is records[eid]
@@ -0,0 +1,41 @@
+import pytest
+
+from missile_core import MissileCommandSim
+from profiler import FrameProfiler
+
+def test_fixed_step_clock():
+    sim = MissileCommandSim(seed=1, tick_rate=30)
+    sim.run(90)
+    assert sim.tick == 90
+    assert sim.time == pytest.approx(3.0)
+    assert sim.elapsed_time == pytest.approx(3.0)
+
+@pytest.mark.parametrize('tick_rate', [0, -30])
+def test_tick_rate_must_be_positive(tick_rate):
+    with pytest.raises(ValueError):
+        MissileCommandSim(seed=1, tick_rate=tick_rate)
+
+def test_one_row_per_frame():
+    # Desenho a 60 Hz, simulação a 30 Hz: metade dos quadros não roda passo
+    sim = MissileCommandSim(seed=1, tick_rate=30)
+    sim.profiler = profiler = FrameProfiler(keep_trace=True)
+    for frame in range(20):
+        profiler.begin_frame()
+        for _ in range(frame % 2):
+            sim.step()
+        if frame == 19:
+            sim.step()  # Quadro atrasado: dois passos
+        profiler.end_frame(sim, render=float(frame), frame=1000 / 60)
+    rows = profiler.trace
+    assert len(rows) == 20
+    assert [row['render'] for row in rows] == [float(frame) for frame in range(20)]
+    assert [row['steps'] for row in rows] == [frame % 2 for frame in range(19)] + [2]
+    assert all(row['step'] == 0 for row in rows if row['steps'] == 0)
+    assert rows[-1]['tick'] == sim.tick == 11
+
+def test_steps_outside_frames_get_own_rows():
+    sim = MissileCommandSim(seed=1)
+    sim.profiler = profiler = FrameProfiler(keep_trace=True)
+    sim.run(5)
+    assert [row['tick'] for row in profiler.trace] == [1, 2, 3, 4, 5]
+    assert all(row['step'] >= 0 for row in profiler.trace)
@@ -0,0 +1,52 @@
+import pytest
+
+from quality import MAX_BACKOFF, TIERS, QualityScaler
+
+def feed(scaler, work_ms, frame_ms=1000 / 60, windows=1):
+    changed = 0
+    for _ in range(scaler.window * windows):
+        changed += scaler.record(work_ms, frame_ms)
+    return changed
+
+@pytest.mark.parametrize('fixed, level', [(0, 0), (2, 2), (len(TIERS), len(TIERS) - 1), (-1, 0)])
+def test_fixed_level_is_clamped_and_never_changes(fixed, level):
+    scaler = QualityScaler(fixed=fixed, window=10)
+    assert scaler.level == level
+    assert scaler.tier is TIERS[level]
+    assert feed(scaler, 100, 100, windows=3) == 0
+    assert scaler.level == level
+
+def test_slow_work_drops_one_level_per_window():
+    scaler = QualityScaler(window=10)
+    feed(scaler, scaler.work_budget * 2)
+    assert scaler.level == 1
+    feed(scaler, scaler.work_budget * 2, windows=10)
+    assert scaler.level == len(TIERS) - 1  # Não passa do último nível
+
+def test_late_frames_drop_even_with_cheap_work():
+    scaler = QualityScaler(window=10)
+    feed(scaler, 0.1, scaler.frame_budget * 2)
+    assert scaler.level == 1
+
+def test_recovery_waits_longer_after_each_failure():
+    scaler = QualityScaler(window=10)
+    slow, fast = scaler.work_budget * 2, scaler.work_budget * 0.1
+    feed(scaler, slow)
+    # A queda dobrou a espera para voltar ao nível 0: duas janelas com folga
+    feed(scaler, fast)
+    assert scaler.level == 1
+    feed(scaler, fast)
+    assert scaler.level == 0
+    feed(scaler, slow)  # Falhou de novo: agora são quatro
+    assert scaler.level == 1
+    feed(scaler, fast, windows=3)
+    assert scaler.level == 1
+    feed(scaler, fast)
+    assert scaler.level == 0
+    assert scaler.backoff[0] == 4 <= MAX_BACKOFF
+
+def test_partial_window_does_not_decide():
+    scaler = QualityScaler(window=10)
+    for _ in range(9):
+        assert not scaler.record(100, 100)
+    assert scaler.record(100, 100)
@@ -0,0 +1,55 @@
+from missile_core import MissileCommandSim
+from policies import InterceptPolicy
+from replay import Replay, ReplayPlayer, ReplayRecorder, state_checksum
+
+TICKS = 3000
+
+def record_game(path, ticks=TICKS, close=True):
+    sim = MissileCommandSim(seed=42, overrides={'LEVEL_INTERVAL': 20})
+    recorder = ReplayRecorder(path, sim)
+    policy = InterceptPolicy()
+    touch = sim.touch
+    # Como o jogo faz: o toque que vai para a simulação é o do arquivo
+    sim.touch = lambda x, y: touch(*recorder.touch(x, y))
+    for _ in range(ticks):
+        policy(sim)
+        sim.step()
+        recorder.step()
+    if close:
+        recorder.close()
+    return sim, recorder
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'game.mcr')
+    sim, _ = record_game(path)
+    replay = Replay(path)
+    assert replay.end_tick == TICKS
+    assert replay.touches and replay.checksums
+    player = ReplayPlayer(replay)
+    replayed = player.run()
+    assert player.mismatches == []
+    assert replayed.score == sim.score
+    assert state_checksum(replayed) == state_checksum(sim)
+
+def test_seek_matches_straight_run(tmp_path):
+    path = str(tmp_path / 'game.mcr')
+    record_game(path)
+    replay = Replay(path)
+    player = ReplayPlayer(replay)
+    forward = state_checksum(player.seek(1700))
+    player.seek(2900)
+    back = state_checksum(player.seek(1700))
+    straight = state_checksum(ReplayPlayer(replay).run(1700))
+    assert forward == back == straight
+    assert player.mismatches == []
+
+def test_interrupted_recording_keeps_checksummed_part(tmp_path):
+    # Sem close(): o que foi até o último checksum já está no arquivo
+    path = str(tmp_path / 'game.mcr')
+    _, recorder = record_game(path, ticks=TICKS + 100, close=False)
+    recorder.file.close()  # O app morreu: sem o registro de fim
+    replay = Replay(path)
+    assert replay.end_tick == TICKS
+    player = ReplayPlayer(replay)
+    player.run()
+    assert player.mismatches == []
@@ -0,0 +1,43 @@
+import math
+
+from missile_core import MissileCommandSim
+from scheduler import EventScheduler
+
+def test_pop_due_in_time_then_schedule_order():
+    events = EventScheduler()
+    events.schedule(2.0, 'b', 2)
+    events.schedule(1.0, 'a', 1)
+    events.schedule(2.0, 'c', 3, 'x')
+    events.schedule(5.0, 'd', 4)
+    assert list(events.pop_due(2.0)) == [('a', 1, None), ('b', 2, None), ('c', 3, 'x')]
+    assert len(events) == 1
+    assert list(events.pop_due(4.9)) == []
+    events.clear()
+    assert len(events) == 0
+
+def test_interceptor_detonates_on_arrival_tick():
+    sim = MissileCommandSim(seed=1)
+    distance = 360 * 0.5  # Meio segundo a INTERCEPTOR_SPEED
+    eid = sim.add_interceptor((500, 100), (500, 100 + distance))
+    arrival = math.ceil(0.5 * sim.tick_rate - 1e-9)
+    sim.run(arrival - 1)
+    assert eid in sim.interceptor_missiles
+    explosions = len(sim.explosions)
+    sim.step()
+    assert eid not in sim.interceptor_missiles
+    # Explode no alvo, não onde o último passo parou
+    assert len(sim.explosions) == explosions + 1
+    assert [e.center_point for e in sim.explosions][-1] == (500, 100 + distance)
+
+def test_enemy_city_hit_at_scheduled_time():
+    sim = MissileCommandSim(seed=1, tick_rate=30)
+    city = sim.cities[0]
+    start = (city.pos[0], city.pos[1] + 600)
+    eid = sim.add_enemy(start, city.pos, 200)
+    # Encosta na cidade a 600 - (raio da cidade + do míssil) px
+    hit_tick = math.ceil((600 - 35) / 200 * sim.tick_rate)
+    sim.run(hit_tick - 1)
+    assert eid in sim.enemy_missiles and city.lives == 3
+    sim.step()
+    assert eid not in sim.enemy_missiles
+    assert city.lives == 2
@@ -0,0 +1,27 @@
+import numpy as np
+
+from spatial_hash import SpatialHash
+
+def brute_force(px, py, cx, cy, radius):
+    pairs = [(c, p) for c in range(len(cx)) for p in range(len(px))
+             if (px[p]-cx[c])**2 + (py[p]-cy[c])**2 < radius[c]**2]
+    return sorted(pairs)
+
+def test_query_circles_matches_brute_force():
+    rng = np.random.default_rng(3)
+    # Pontos também fora da tela (células negativas) e raios maiores que a célula
+    px, py = rng.uniform(-200, 1200, 400), rng.uniform(-200, 2400, 400)
+    cx, cy = rng.uniform(-100, 1100, 60), rng.uniform(-100, 2300, 60)
+    radius = rng.uniform(1, 250, 60)
+    grid = SpatialHash()
+    grid.build(px, py)
+    circle, point = grid.query_circles(cx, cy, radius)
+    assert list(zip(circle.tolist(), point.tolist())) == brute_force(px, py, cx, cy, radius)
+
+def test_query_circles_empty():
+    grid = SpatialHash()
+    circle, point = grid.query_circles([10.0], [10.0], 50)
+    assert len(circle) == len(point) == 0
+    grid.build([5.0], [5.0])
+    assert grid.query_circle((0, 0), 10).tolist() == [0]
+    assert grid.query_circle((100, 100), 10).tolist() == []
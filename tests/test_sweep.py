@@ -0,0 +1,37 @@
+import numpy as np
+
+from missile_core import MissileCommandSim
+from sweep import swept_hits
+
+def test_swept_hits_catches_crossing_between_steps():
+    # 75 px por passo (1500 px/s a 20 Hz) contra um círculo de raio 15: as
+    # duas pontas ficam fora, o meio do trecho passa pelo centro
+    hit, t = swept_hits(-40.0, 0.0, 35.0, 0.0, 0.0, 0.0, 15.0)
+    assert hit
+    assert np.isclose(t, 25 / 75)
+
+def test_swept_hits_misses_and_starts_inside():
+    hit, _ = swept_hits(np.array([-40.0, -40.0, 5.0]), np.array([20.0, 0.0, 0.0]),
+                        np.array([35.0, -20.0, 50.0]), np.array([20.0, 0.0, 0.0]), 0.0, 0.0, 15.0)
+    # Passa ao lado; para antes do círculo; começa dentro
+    assert hit.tolist() == [False, False, True]
+
+def test_fast_interceptor_hits_bomb_at_20hz():
+    sim = MissileCommandSim(seed=1, tick_rate=20)
+    sim.add_bomb((500, 1500), (500, 200))
+    y = 1500 - 150 / 20 * 0.5  # Altura da bomba no meio do primeiro passo
+    sim.add_interceptor((400, y), (700, y), speed=1500)
+    score = sim.score
+    for _ in range(6):
+        sim.step()
+    assert len(sim.bombs) == 0
+    assert sim.score == score + 1
+
+def test_fast_enemy_crossing_explosion_at_20hz():
+    sim = MissileCommandSim(seed=1, tick_rate=20)
+    sim.add_explosion((500, 1000), 60).radius = 20
+    eid = sim.add_enemy((500, 1030), (500, 0), 1800)  # 90 px por passo
+    score = sim.score
+    sim.step()
+    assert eid not in sim.enemy_missiles
+    assert sim.score == score + 1
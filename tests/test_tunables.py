@@ -0,0 +1,41 @@
+import pytest
+
+from batch_sim import main, parse_overrides
+from missile_core import MissileCommandSim, TUNABLES, check_tunable
+
+@pytest.mark.parametrize('name, value', [
+    ('LEVEL_INTERVAL', 0), ('ENEMY_SPAWN_INTERVAL', -1), ('BOMB_DROP_INTERVAL', 0),
+    ('INTERCEPTOR_SPEED', 0), ('SLOW_MOTION_FACTOR', -0.5), ('WARNING_DISTANCE', float('nan')),
+    ('NAO_EXISTE', 1),
+])
+def test_check_tunable_rejects(name, value):
+    with pytest.raises(ValueError):
+        check_tunable(name, value)
+    with pytest.raises(ValueError):
+        MissileCommandSim(seed=1, overrides={name: value})
+
+@pytest.mark.parametrize('name', TUNABLES)
+def test_defaults_are_valid(name):
+    check_tunable(name, getattr(MissileCommandSim, name))
+
+def test_zero_explosion_range_is_kept():
+    sim = MissileCommandSim(seed=1, overrides={'INTERCEPTOR_EXPLOSION_RANGE': 0})
+    assert sim.add_explosion((500, 500), sim.INTERCEPTOR_EXPLOSION_RANGE).explosion_range == 0
+    assert sim.add_explosion((500, 500)).explosion_range == sim.BASE_EXPLOSION_RANGE
+
+def test_parse_overrides():
+    assert parse_overrides(['LEVEL_INTERVAL=20,30', 'INTERCEPTOR_SPEED=400']) == [
+        {'LEVEL_INTERVAL': 20.0, 'INTERCEPTOR_SPEED': 400.0},
+        {'LEVEL_INTERVAL': 30.0, 'INTERCEPTOR_SPEED': 400.0},
+    ]
+
+@pytest.mark.parametrize('item', ['LEVEL_INTERVAL=0', 'LEVEL_INTERVAL=abc', 'NAO_EXISTE=1',
+                                  'BOMB_DROP_INTERVAL=3,0'])
+def test_parse_overrides_fails_fast(item):
+    with pytest.raises(SystemExit):
+        parse_overrides([item])
+
+@pytest.mark.parametrize('hz', ['0', '-30'])
+def test_batch_rejects_bad_rate(hz, tmp_path):
+    with pytest.raises(SystemExit):
+        main(['--hz', hz, '--games', '1', '--output', str(tmp_path / 'out.csv')])
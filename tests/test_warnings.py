@@ -0,0 +1,22 @@
+import math
+
+import pytest
+
+from missile_core import MissileCommandSim
+from policies import InterceptPolicy
+
+def scanned_warnings(sim):
+    # O jeito antigo: a cada passo, todo inimigo contra toda cidade
+    enemies = sim.enemy_missiles
+    return {eid for eid, x, y in enemies.items() if eid in enemies
+            and any(math.hypot(x-city.pos[0], y-city.pos[1]) < sim.WARNING_DISTANCE for city in sim.cities)}
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_scheduled_warnings_match_scan(seed):
+    # Inclui slow motion, cidades caindo (reagendamento) e game over
+    sim = MissileCommandSim(seed=seed)
+    policy = InterceptPolicy()
+    for _ in range(4000):
+        policy(sim)
+        sim.step()
+        assert sim.warnings == scanned_warnings(sim), f"tick {sim.tick}"
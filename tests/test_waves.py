@@ -0,0 +1,74 @@
+import copy
+import json
+import os
+
+import pytest
+
+from missile_core import MissileCommandSim
+from waves import DEFAULT_WAVES, check_waves, curve_value, load_waves
+
+RUSH = os.path.join(os.path.dirname(__file__), '..', 'levels', 'rush.json')
+
+@pytest.fixture
+def rush():
+    with open(RUSH) as f:
+        return json.load(f)
+
+def test_curve_value():
+    assert curve_value(3, 7) == 3
+    assert [curve_value([2.0, 1.5, 1.0], level) for level in (1, 2, 3, 9)] == [2.0, 1.5, 1.0, 1.0]
+
+def test_shipped_definitions_are_valid():
+    check_waves(DEFAULT_WAVES)
+    sim = MissileCommandSim(seed=1, waves=load_waves(RUSH))
+    sim.run(60 * 60)
+    assert sim.level == 3  # 25 s por nível
+
+@pytest.mark.parametrize('change', [
+    lambda w: w['spawns'][0].update(every=0),
+    lambda w: w['spawns'][0].update(every=-1),
+    lambda w: w['spawns'][0].update(every=[]),
+    lambda w: w['spawns'][0].update(every='2'),
+    lambda w: w['spawns'][1].update(from_level='2'),
+    lambda w: w['spawns'][1].update(from_level=0),
+    lambda w: w['spawns'].append({'entity': 'missing'}),
+    lambda w: w.update(level_duration=0),
+    lambda w: w.update(level_duration=[25]),
+    lambda w: w.update(constants={'LEVEL_INTERVAL': '20'}),
+    lambda w: w.update(constants=[1]),
+    lambda w: w.pop('spawns'),
+    lambda w: w.pop('entities'),
+    lambda w: w['entities']['airplane'].update(bomb_interval=[3, 0]),
+    lambda w: w['entities']['fast'].update(speed=[]),
+    lambda w: w['entities']['enemy'].update(speed_per_level=-1),
+    lambda w: w['entities']['enemy'].update(kind='boss'),
+    lambda w: w['entities']['powerup'].update(types=[]),
+    lambda w: w['entities']['powerup'].update(types=['shield']),
+])
+def test_bad_definitions_raise_value_error(rush, change, tmp_path):
+    change(rush)
+    with pytest.raises(ValueError):
+        check_waves(rush)
+    path = tmp_path / 'bad.json'
+    path.write_text(json.dumps(rush))
+    with pytest.raises(ValueError):
+        load_waves(str(path))
+
+@pytest.mark.parametrize('constants', [{'LEVEL_INTERVAL': 0}, {'NAO_EXISTE': 1}])
+def test_constants_are_checked_by_the_sim(rush, constants):
+    rush.pop('level_duration')
+    rush['constants'] = constants
+    with pytest.raises(ValueError):
+        MissileCommandSim(seed=1, waves=rush)
+
+def test_compile_level_refuses_non_positive_interval():
+    # Constante inválida que escapou da validação (trocada depois de criar a sim)
+    sim = MissileCommandSim(seed=1)
+    sim.ENEMY_SPAWN_INTERVAL = 0
+    with pytest.raises(ValueError):
+        sim.enter_level(2, sim.wave.end)
+    waves = copy.deepcopy(DEFAULT_WAVES)
+    sim = MissileCommandSim(seed=1, waves=waves)
+    sim.LEVEL_INTERVAL = 0
+    with pytest.raises(ValueError):
+        sim.start_level(1)
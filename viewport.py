@@ -0,0 +1,23 @@
+# Transformação entre o mundo da simulação e a tela.
+#
+# A simulação trabalha num mundo de tamanho fixo (unidades lógicas, ex.:
+# 1080 x 2200) que não depende da janela; na tela ele é desenhado com a maior
+# escala em que cabe inteiro, centralizado, com faixas nas sobras. A escala e
+# o deslocamento só são recalculados quando a janela muda de tamanho (fit).
+class Viewport:
+    def __init__(self, world_width, world_height, screen_width=None, screen_height=None):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.fit(screen_width or world_width, screen_height or world_height)
+    def fit(self, screen_width, screen_height):
+        self.scale = min(screen_width / self.world_width, screen_height / self.world_height)
+        self.offset = ((screen_width - self.world_width * self.scale) / 2,
+                       (screen_height - self.world_height * self.scale) / 2)
+    def to_world(self, x, y):
+        return (x - self.offset[0]) / self.scale, (y - self.offset[1]) / self.scale
+    def to_screen(self, x, y):
+        return x * self.scale + self.offset[0], y * self.scale + self.offset[1]
+    def screen_rect(self):
+        # Área do mundo na tela: (x, y, largura, altura)
+        return (self.offset[0], self.offset[1],
+                self.world_width * self.scale, self.world_height * self.scale)
@@ -0,0 +1,160 @@
+# Ondas de inimigos definidas por dados, compiladas nível a nível.
+#
+# Uma definição de ondas (JSON, ver levels/) diz que tipos de entidade
+# existem, com que velocidade andam e a cada quanto tempo aparecem em cada
+# nível. Ao entrar num nível a simulação compila a definição numa única
+# linha do tempo ordenada de spawns, com os sorteios (posição, cidade-alvo,
+# tipo de power-up) já feitos; durante o nível só consome essa lista.
+#
+#   {
+#     "level_duration": 30,                       # segundos por nível
+#     "constants": {"BOMB_EXPLOSION_RANGE": 90},  # troca constantes (TUNABLES)
+#     "entities": {                               # tipos, cada um de um "kind"
+#       "enemy": {"kind": "enemy", "speed": 120, "speed_per_level": 30},
+#       "fast": {"kind": "enemy", "speed": 240},
+#       "airplane": {"kind": "airplane", "speed": 200, "bomb_interval": 3},
+#       "powerup": {"kind": "powerup", "types": ["bomb", "slow"]}
+#     },
+#     "spawns": [                                 # um tipo a cada "every" segundos
+#       {"entity": "enemy", "every": [2.0, 1.8, 1.5]},  # por nível; o último vale daí em diante
+#       {"entity": "fast", "every": 6, "from_level": 3}
+#     ]
+#   }
+#
+# Velocidades, intervalos e "every" aceitam número ou curva por nível, sempre
+# maiores que zero (check_waves recusa o resto, assim como listas vazias). Valor
+# omitido usa a constante da simulação (INITIAL_ENEMY_SPEED,
+# ENEMY_SPAWN_INTERVAL...), então os overrides continuam valendo.
+import json
+
+KINDS = ('enemy', 'airplane', 'powerup')
+POWERUP_TYPES = ('bomb', 'slow')
+
+# O jogo padrão: um inimigo, um avião e um power-up, nos intervalos das constantes
+DEFAULT_WAVES = {
+    'entities': {
+        'enemy': {'kind': 'enemy'},
+        'airplane': {'kind': 'airplane'},
+        'powerup': {'kind': 'powerup'},
+    },
+    'spawns': [
+        {'entity': 'enemy'},
+        {'entity': 'airplane'},
+        {'entity': 'powerup'},
+    ],
+}
+
+def load_waves(path):
+    with open(path) as f:
+        waves = json.load(f)
+    check_waves(waves)
+    return waves
+
+def check_waves(waves):
+    # ValueError para qualquer definição que a compilação não saiba usar.
+    # Intervalos, durações e velocidades precisam ser > 0: com 0 a compilação
+    # (ou o reagendamento das bombas) repete o mesmo instante para sempre
+    if not isinstance(waves, dict):
+        raise ValueError("a definição de ondas deve ser um objeto JSON")
+    for key, kind in (('entities', dict), ('spawns', list)):
+        if not isinstance(waves.get(key), kind):
+            raise ValueError(f"{key}: campo obrigatório ({'objeto' if kind is dict else 'lista'})")
+    duration = waves.get('level_duration', 1)
+    if isinstance(duration, (list, tuple)):
+        raise ValueError(f"level_duration: esperava número, recebeu {duration!r}")
+    check_curve('level_duration', duration)
+    constants = waves.get('constants', {})
+    if not isinstance(constants, dict):
+        raise ValueError("constants deve ser um objeto {NOME: valor}")
+    for name, value in constants.items():
+        # A faixa de cada constante é conferida pela simulação (check_tunable)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"constants: {name}: esperava número, recebeu {value!r}")
+    entities = waves['entities']
+    for name, entity in entities.items():
+        if not isinstance(entity, dict) or entity.get('kind') not in KINDS:
+            raise ValueError(f"entidade {name}: kind deve ser um de {', '.join(KINDS)}")
+        for field in ('speed', 'bomb_interval'):
+            if field in entity:
+                check_curve(f"entidade {name}: {field}", entity[field])
+        if 'speed_per_level' in entity:
+            check_curve(f"entidade {name}: speed_per_level", entity['speed_per_level'], minimum=0)
+        types = entity.get('types', POWERUP_TYPES)
+        if not isinstance(types, (list, tuple)) or not types or any(t not in POWERUP_TYPES for t in types):
+            raise ValueError(f"entidade {name}: types deve ser uma lista não vazia de {', '.join(POWERUP_TYPES)}")
+    for rule in waves['spawns']:
+        if not isinstance(rule, dict) or not isinstance(rule.get('entity'), str) or rule['entity'] not in entities:
+            raise ValueError(f"spawn de entidade desconhecida: {rule.get('entity') if isinstance(rule, dict) else rule!r}")
+        if 'every' in rule:
+            check_curve(f"spawn de {rule['entity']}: every", rule['every'])
+        from_level = rule.get('from_level', 1)
+        if isinstance(from_level, bool) or not isinstance(from_level, int) or from_level < 1:
+            raise ValueError(f"spawn de {rule['entity']}: from_level deve ser um inteiro >= 1 (recebeu {from_level!r})")
+
+def check_curve(where, curve, minimum=None):
+    # Número ou lista não vazia de números; > 0, ou >= minimum se dado
+    values = curve if isinstance(curve, (list, tuple)) else [curve]
+    if not values:
+        raise ValueError(f"{where}: a curva não pode ser vazia")
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{where}: esperava número, recebeu {value!r}")
+        if minimum is None and not value > 0:
+            raise ValueError(f"{where}: deve ser maior que zero (recebeu {value:g})")
+        if minimum is not None and not value >= minimum:
+            raise ValueError(f"{where}: deve ser pelo menos {minimum:g} (recebeu {value:g})")
+
+def curve_value(curve, level):
+    # Valor de uma curva por nível: número fixo ou lista (o último se repete)
+    if isinstance(curve, (list, tuple)):
+        return curve[min(level, len(curve)) - 1]
+    return curve
+
+class CompiledLevel:
+    def __init__(self, level, start, end, timeline):
+        self.level = level
+        self.start = start
+        self.end = end
+        self.timeline = timeline  # [(instante, kind, parâmetros)], em ordem
+        self.counts = {kind: 0 for kind in KINDS}
+        for _, kind, _ in timeline:
+            self.counts[kind] += 1
+
+def compile_level(sim, waves, level, start, next_times):
+    # Linha do tempo do nível que começa em `start`. next_times guarda, por
+    # regra de spawn, o instante do próximo spawn (continua entre níveis)
+    duration = waves.get('level_duration', sim.LEVEL_INTERVAL)
+    if not duration > 0:
+        raise ValueError(f"duração do nível deve ser maior que zero (recebeu {duration:g})")
+    end = start + duration
+    rng = sim.rng
+    entities = waves['entities']
+    timeline = []
+    for i, rule in enumerate(waves['spawns']):
+        if level < rule.get('from_level', 1):
+            continue
+        entity = entities[rule['entity']]
+        kind = entity['kind']
+        default_every = {'enemy': sim.ENEMY_SPAWN_INTERVAL, 'airplane': sim.AIRPLANE_SPAWN_INTERVAL,
+                         'powerup': sim.POWERUP_SPAWN_INTERVAL}[kind]
+        every = curve_value(rule.get('every', default_every), level)
+        if not every > 0:
+            raise ValueError(f"spawn de {rule['entity']}: intervalo deve ser maior que zero (recebeu {every:g})")
+        t = next_times.get(i, start + every)
+        while t < end:
+            if kind == 'enemy':
+                speed = (curve_value(entity.get('speed', sim.INITIAL_ENEMY_SPEED), level)
+                         + level * entity.get('speed_per_level', sim.ENEMY_SPEED_PER_LEVEL))
+                params = (rng.randint(50, int(sim.width-50)), rng.random(), speed)
+            elif kind == 'airplane':
+                params = (curve_value(entity.get('speed', 200), level),
+                          curve_value(entity.get('bomb_interval', sim.BOMB_DROP_INTERVAL), level))
+            else:
+                params = (rng.randint(30, int(sim.width-30)),
+                          rng.choice(entity.get('types', POWERUP_TYPES)))
+            timeline.append((t, i, kind, params))
+            t += every
+        next_times[i] = t
+    # Em ordem de tempo; no empate, na ordem das regras
+    timeline.sort(key=lambda item: (item[0], item[1]))
+    return CompiledLevel(level, start, end, [(t, kind, params) for t, _, kind, params in timeline])